@@ -1 +1,38 @@
-from .random_agent import RandomAgent
+from importlib import import_module
+
+# Every agent by its name on the command line, as "module:class", along with the other
+# public classes of the agent modules. Modules are imported only when they are used, so
+# that a process only pays for the agents it plays with.
+AGENTS: dict[str, str] = {
+    "random": "random_agent:RandomAgent",
+    "expectimax": "expectimax_agent:ExpectimaxAgent",
+    "montecarlo": "monte_carlo_agent:MonteCarloAgent",
+    "ntuple": "ntuple_agent:NTupleAgent",
+}
+_CLASSES: dict[str, str] = {
+    **{path.split(":")[1]: path for path in AGENTS.values()},
+    "NTupleNetwork": "ntuple_agent:NTupleNetwork",
+}
+__all__ = list(_CLASSES)
+
+
+def _load(path: str) -> type:
+    module, name = path.split(":")
+    return getattr(import_module(f".{module}", __name__), name)
+
+
+def load_agent(name: str) -> type:
+    """Import and return the class of the agent with the given name."""
+    if name not in AGENTS:
+        raise ValueError("Agent not available.")
+    return _load(AGENTS[name])
+
+
+def __getattr__(name: str) -> type:
+    if name in _CLASSES:
+        return _load(_CLASSES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,241 @@
+from collections import OrderedDict
+from time import perf_counter
+
+from core.agent import Agent
+from core import Moves, State
+from core.model.bitboard import (
+    Bitboard,
+    NUM_ROWS,
+    ROW_MASK,
+    canonical_board,
+    empty_indices,
+    execute_move,
+    row_tables,
+    transpose,
+)
+
+# Weights of the row heuristic, following the well known expectimax players for 2048.
+LOST_PENALTY: float = 200000.0
+MONOTONICITY_POWER: float = 4.0
+MONOTONICITY_WEIGHT: float = 47.0
+SUM_POWER: float = 3.5
+SUM_WEIGHT: float = 11.0
+MERGES_WEIGHT: float = 700.0
+EMPTY_WEIGHT: float = 270.0
+
+_row_heuristics: list[float] | None = None
+
+
+def _row_heuristic(row: int) -> float:
+    """Score a packed row by how many empty cells and merges it offers, how monotonic
+    it is and how large its tiles are."""
+    exponents = [(row >> (4 * i)) & 0xF for i in range(4)]
+    empty = exponents.count(0)
+    merges = 0
+    prev = 0
+    counter = 0
+    for exponent in exponents:
+        if exponent == 0:
+            continue
+        if prev == exponent:
+            counter += 1
+        elif counter > 0:
+            merges += 1 + counter
+            counter = 0
+        prev = exponent
+    if counter > 0:
+        merges += 1 + counter
+    monotonicity_left = monotonicity_right = 0.0
+    for a, b in zip(exponents, exponents[1:]):
+        if a > b:
+            monotonicity_left += a**MONOTONICITY_POWER - b**MONOTONICITY_POWER
+        else:
+            monotonicity_right += b**MONOTONICITY_POWER - a**MONOTONICITY_POWER
+    total = sum(exponent**SUM_POWER for exponent in exponents)
+    return (
+        LOST_PENALTY
+        + EMPTY_WEIGHT * empty
+        + MERGES_WEIGHT * merges
+        - MONOTONICITY_WEIGHT * min(monotonicity_left, monotonicity_right)
+        - SUM_WEIGHT * total
+    )
+
+
+def row_heuristics() -> list[float]:
+    """Return the heuristic score of every packed row, building the table on first use."""
+    global _row_heuristics
+    if _row_heuristics is None:
+        _row_heuristics = [_row_heuristic(row) for row in range(NUM_ROWS)]
+    return _row_heuristics
+
+
+class SearchTimeout(Exception):
+    """Raised when a search exceeds its time budget."""
+
+
+class ExpectimaxAgent(Agent):
+    """
+    An agent which searches the game tree with expectimax: the agent picks the move
+    with the highest expected score, where the expectation is taken over all tile
+    spawns, weighted by the spawn probabilities of State.
+
+    The search runs on packed bitboards and caches evaluated positions in a bounded
+    transposition table with least recently used eviction. Spawns which are too
+    unlikely to matter, measured by the cumulative probability of reaching them,
+    are not expanded. If a time budget is given, the agent deepens its search one
+    move at a time and plays the best move of the deepest search that completed.
+    """
+
+    PROBABILITY_TWO: float = State.PROBABILITY_TWO
+    PROBABILITY_FOUR: float = State.PROBABILITY_FOUR
+
+    def __init__(
+        self,
+        depth: int = 3,
+        time_budget: float | None = None,
+        min_probability: float = 0.0001,
+        cache_size: int = 100000,
+        symmetric_cache: bool = False,
+    ) -> None:
+        """
+        Initialize an expectimax agent.
+
+        Args:
+            depth: The maximum number of moves to look ahead.
+            time_budget: An optional number of seconds to spend per move.
+            min_probability: Positions reached with a lower cumulative probability
+            are evaluated instead of expanded.
+            cache_size: The maximum number of entries of the transposition table.
+            symmetric_cache: Key the transposition table by canonical boards, so that
+            all rotations and reflections of a position share one entry.
+        """
+        super().__init__()
+        self._depth = depth
+        self._time_budget = time_budget
+        self._min_probability = min_probability
+        self._cache_size = cache_size
+        self._symmetric_cache = symmetric_cache
+        self._cache: OrderedDict[int, tuple[int, float]] = OrderedDict()
+        self._deadline = float("inf")
+        # Build the move and heuristic tables now rather than on the first move, so
+        # that the first decision keeps to the time budget too
+        row_tables()
+        self._heuristics = row_heuristics()
+        self.reset_counters()
+
+    def reset_counters(self) -> None:
+        """Reset the performance counters."""
+        self._decisions = 0
+        self._decision_time = 0.0
+        self._positions_evaluated = 0
+
+    def get_move(self, state: State) -> Moves:
+        """Return the legal move with the highest expected score."""
+        start = perf_counter()
+        board = Bitboard.from_state(state).board
+        children = []
+        for move in Moves:
+            after = execute_move(board, move)[0]
+            if after != board:
+                children.append((move, after))
+        best = children[0][0]
+        if self._time_budget is None:
+            self._deadline = float("inf")
+            best = self._search(children, self._depth)
+        else:
+            self._deadline = start + self._time_budget
+            for depth in range(1, self._depth + 1):
+                try:
+                    best = self._search(children, depth)
+                except SearchTimeout:
+                    break
+        self._decisions += 1
+        self._decision_time += perf_counter() - start
+        return best
+
+    def _search(self, children: list[tuple[Moves, int]], depth: int) -> Moves:
+        """Return the move among CHILDREN (pairs of moves and resulting boards) with
+        the highest expected score when searching DEPTH moves ahead."""
+        best_move, best_score = children[0][0], float("-inf")
+        for move, after in children:
+            score = self._chance_node(after, depth - 1, 1.0)
+            if score > best_score:
+                best_move, best_score = move, score
+        return best_move
+
+    def _chance_node(self, board: int, depth: int, probability: float) -> float:
+        """Return the expected score of BOARD over all possible tile spawns."""
+        if depth == 0 or probability < self._min_probability:
+            return self.evaluate(board)
+        cache = self._cache
+        key = canonical_board(board)[0] if self._symmetric_cache else board
+        entry = cache.get(key)
+        if entry is not None and entry[0] >= depth:
+            cache.move_to_end(key)
+            return entry[1]
+        empty = empty_indices(board)
+        probability_two = probability * self.PROBABILITY_TWO / len(empty)
+        probability_four = probability * self.PROBABILITY_FOUR / len(empty)
+        score = 0.0
+        for index in empty:
+            shift = 4 * index
+            score += self.PROBABILITY_TWO * self._max_node(
+                board | 1 << shift, depth, probability_two
+            )
+            score += self.PROBABILITY_FOUR * self._max_node(
+                board | 2 << shift, depth, probability_four
+            )
+        score /= len(empty)
+        cache[key] = (depth, score)
+        if len(cache) > self._cache_size:
+            cache.popitem(last=False)
+        return score
+
+    def _max_node(self, board: int, depth: int, probability: float) -> float:
+        """Return the score of the best move on BOARD, or zero if no move is left."""
+        if perf_counter() > self._deadline:
+            raise SearchTimeout()
+        best = 0.0
+        for move in Moves:
+            after = execute_move(board, move)[0]
+            if after != board:
+                best = max(best, self._chance_node(after, depth - 1, probability))
+        return best
+
+    def evaluate(self, board: int) -> float:
+        """Return the heuristic score of a packed board, summed over its rows and columns."""
+        self._positions_evaluated += 1
+        table = self._heuristics
+        t = transpose(board)
+        return (
+            table[board & ROW_MASK]
+            + table[(board >> 16) & ROW_MASK]
+            + table[(board >> 32) & ROW_MASK]
+            + table[board >> 48]
+            + table[t & ROW_MASK]
+            + table[(t >> 16) & ROW_MASK]
+            + table[(t >> 32) & ROW_MASK]
+            + table[t >> 48]
+        )
+
+    @property
+    def decisions(self) -> int:
+        """The number of moves decided since the counters were last reset."""
+        return self._decisions
+
+    @property
+    def positions_evaluated(self) -> int:
+        """The number of positions evaluated since the counters were last reset."""
+        return self._positions_evaluated
+
+    @property
+    def time_per_decision(self) -> float:
+        """The average number of seconds spent per move."""
+        return self._decision_time / self._decisions if self._decisions else 0.0
+
+    @property
+    def positions_per_second(self) -> float:
+        """The average number of positions evaluated per second of search."""
+        if self._decision_time == 0:
+            return 0.0
+        return self._positions_evaluated / self._decision_time
@@ -0,0 +1,136 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from random import Random
+from time import perf_counter
+
+from core.agent import Agent
+from core import Moves, State
+from core.model.bitboard import Bitboard, empty_indices, execute_move
+from core.model.rng import RandomSource
+
+MOVES = list(Moves)
+
+
+def rollout(board: int, rng: RandomSource) -> int:
+    """Play a random game on a packed board, starting with a tile spawn, until no move
+    is left, and return the number of points gained."""
+    rand = rng.random
+    probability_two = State.PROBABILITY_TWO
+    points = 0
+    while True:
+        empty = empty_indices(board)
+        exponent = 1 if rand() < probability_two else 2
+        board |= exponent << (4 * empty[int(rand() * len(empty))])
+        children = []
+        for move in MOVES:
+            after, gained = execute_move(board, move)
+            if after != board:
+                children.append((after, gained))
+        if not children:
+            return points
+        board, gained = children[int(rand() * len(children))]
+        points += gained
+
+
+def run_rollouts(
+    board: int, num_rollouts: int | None, time_budget: float | None, seed: int
+) -> tuple[int, int]:
+    """Run NUM_ROLLOUTS random games from a packed board, or as many as fit into
+    TIME_BUDGET seconds, whichever limit comes first (but at least one). Returns the
+    total number of points gained and the number of games played. This runs in worker
+    processes, so it only takes and returns plain integers."""
+    rng = Random(seed)
+    deadline = perf_counter() + time_budget if time_budget is not None else None
+    total = count = 0
+    while count == 0 or (
+        (num_rollouts is None or count < num_rollouts)
+        and (deadline is None or perf_counter() < deadline)
+    ):
+        total += rollout(board, rng)
+        count += 1
+    return total, count
+
+
+class MonteCarloAgent(Agent):
+    """
+    An agent which plays many random games from the result of every legal move and
+    picks the move with the best average final score. Rollouts are split across a pool
+    of worker processes (or threads), which only receive the packed bitboard of the
+    position, so no State, Grid or GridView objects are copied or pickled.
+    """
+
+    def __init__(
+        self,
+        num_rollouts: int | None = 100,
+        time_budget: float | None = None,
+        workers: int | None = None,
+        use_threads: bool = False,
+        rng: RandomSource | None = None,
+    ) -> None:
+        """
+        Initialize a Monte Carlo agent.
+
+        Args:
+            num_rollouts: The number of random games to play per legal move, or None
+            to play as many as fit into the time budget.
+            time_budget: An optional number of seconds to spend per move.
+            workers: The number of workers to split rollouts across. Defaults to the
+            number of cores. With a single worker, rollouts run in the calling process.
+            use_threads: Use a thread pool instead of a process pool.
+            rng: An optional random number generator to seed the rollouts from.
+        """
+        super().__init__(rng)
+        if num_rollouts is None and time_budget is None:
+            raise ValueError("Either num_rollouts or time_budget must be given.")
+        self._num_rollouts = num_rollouts
+        self._time_budget = time_budget
+        self._workers = workers if workers is not None else os.cpu_count() or 1
+        self._use_threads = use_threads
+        self._executor: Executor | None = None
+
+    def _seed(self) -> int:
+        return int(self._rng.random() * 2**32)
+
+    def get_move(self, state: State) -> Moves:
+        """Return the legal move with the highest average score over random games."""
+        board = Bitboard.from_state(state).board
+        children = []
+        for move in MOVES:
+            after, gained = execute_move(board, move)
+            if after != board:
+                children.append((move, after, gained))
+        # Split the rollouts of every move into one task per worker, such that all
+        # workers are busy for the whole time budget
+        num_rollouts = self._num_rollouts
+        if num_rollouts is not None:
+            num_rollouts = max(1, num_rollouts // self._workers)
+        time_budget = self._time_budget
+        if time_budget is not None:
+            time_budget /= len(children)
+        tasks = [
+            (move, gained, (after, num_rollouts, time_budget, self._seed()))
+            for move, after, gained in children
+            for _ in range(self._workers)
+        ]
+        if self._workers > 1:
+            if self._executor is None:
+                pool = ThreadPoolExecutor if self._use_threads else ProcessPoolExecutor
+                self._executor = pool(self._workers)
+            futures = [self._executor.submit(run_rollouts, *args) for _, _, args in tasks]
+            results = [future.result() for future in futures]
+        else:
+            results = [run_rollouts(*args) for _, _, args in tasks]
+        totals: dict[Moves, list[float]] = {}
+        for (move, gained, _), (total, count) in zip(tasks, results):
+            entry = totals.setdefault(move, [gained, 0, 0])
+            entry[1] += total
+            entry[2] += count
+        return max(
+            totals, key=lambda move: totals[move][0] + totals[move][1] / totals[move][2]
+        )
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,173 @@
+import mmap
+import struct
+from array import array
+
+from core.agent import Agent
+from core import Moves, State
+from core.model.bitboard import Bitboard, execute_move
+from core.model.rng import RandomSource
+from core.model.symmetry import SYMMETRIES
+
+# Straight lines of the outer and inner rows and squares in the corner, edge and middle
+# of the board. Every pattern is applied in all 8 orientations of the board.
+DEFAULT_PATTERNS: tuple[tuple[int, ...], ...] = (
+    (0, 1, 2, 3),
+    (4, 5, 6, 7),
+    (0, 1, 4, 5),
+    (1, 2, 5, 6),
+    (5, 6, 9, 10),
+)
+
+
+class NTupleNetwork:
+    """
+    A value function over packed 4x4 boards given by an n-tuple network. Each pattern
+    (a tuple of cells) owns a lookup table with one weight for every combination of
+    tile exponents on its cells, and the value of a board is the sum of the weights
+    selected by every pattern in every orientation of the board.
+
+    The weights of all patterns are stored in one flat array of 32-bit floats. Saved
+    networks are memory-mapped when loaded, so that loading is instant and worker
+    processes share the same pages of memory.
+    """
+
+    MAGIC = b"NTUPLE\x00\x01"
+
+    def __init__(
+        self,
+        patterns: tuple[tuple[int, ...], ...] = DEFAULT_PATTERNS,
+        weights: array | memoryview | None = None,
+    ) -> None:
+        """
+        Initialize a network.
+
+        Args:
+            patterns: The patterns of the network, as tuples of linear cell indices.
+            weights: An optional flat array of all weights. Defaults to all zeros.
+        """
+        self._patterns = tuple(tuple(pattern) for pattern in patterns)
+        # Every feature is given by the offset of its table in the weights and the
+        # (board shift, index shift) of each of its cells
+        self._features: list[tuple[int, tuple[tuple[int, int], ...]]] = []
+        offset = 0
+        for pattern in self._patterns:
+            for symmetry in SYMMETRIES:
+                permutation = symmetry.permutation(4, 4)
+                shifts = tuple(
+                    (4 * permutation[cell], 4 * j) for j, cell in enumerate(pattern)
+                )
+                self._features.append((offset, shifts))
+            offset += 16 ** len(pattern)
+        if weights is None:
+            weights = array("f", bytes(4 * offset))
+        if len(weights) != offset:
+            raise ValueError(f"Expected {offset} weights, got {len(weights)}.")
+        self._weights = weights
+
+    def indices(self, board: int) -> list[int]:
+        """Return the index into the weights selected by every feature of a packed board."""
+        indices = []
+        for offset, shifts in self._features:
+            index = 0
+            for board_shift, index_shift in shifts:
+                index |= ((board >> board_shift) & 0xF) << index_shift
+            indices.append(offset + index)
+        return indices
+
+    def value(self, board: int) -> float:
+        """Return the value of a packed board."""
+        weights = self._weights
+        total = 0.0
+        for offset, shifts in self._features:
+            index = 0
+            for board_shift, index_shift in shifts:
+                index |= ((board >> board_shift) & 0xF) << index_shift
+            total += weights[offset + index]
+        return total
+
+    def update(self, board: int, delta: float) -> None:
+        """Add DELTA to every weight selected by a packed board."""
+        weights = self._weights
+        for index in self.indices(board):
+            weights[index] += delta
+
+    @property
+    def patterns(self) -> tuple[tuple[int, ...], ...]:
+        return self._patterns
+
+    @property
+    def num_features(self) -> int:
+        """The number of weights selected by every board."""
+        return len(self._features)
+
+    def save(self, path: str) -> None:
+        """Save the patterns and weights to a file. The weights are aligned in the file
+        so that they can be memory-mapped as an array of floats."""
+        header = bytearray(self.MAGIC)
+        header += struct.pack("<I", len(self._patterns))
+        for pattern in self._patterns:
+            header += struct.pack("<B", len(pattern)) + bytes(pattern)
+        header += bytes(-len(header) % 4)
+        with open(path, "wb") as f:
+            f.write(header)
+            f.write(array("f", self._weights).tobytes())
+
+    @classmethod
+    def load(cls, path: str, memory_map: bool = True) -> "NTupleNetwork":
+        """Load a network from a file. If MEMORY_MAP is true, the weights are a read-only
+        view of the memory-mapped file, otherwise they are copied into a writable array."""
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if data[: len(cls.MAGIC)] != cls.MAGIC:
+            raise ValueError(f"{path} is not an n-tuple network.")
+        offset = len(cls.MAGIC)
+        (num_patterns,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        patterns = []
+        for _ in range(num_patterns):
+            length = data[offset]
+            patterns.append(tuple(data[offset + 1 : offset + 1 + length]))
+            offset += 1 + length
+        offset += -offset % 4
+        weights = memoryview(data)[offset:].cast("f")
+        if not memory_map:
+            weights = array("f", weights)
+        return cls(tuple(patterns), weights)
+
+
+class NTupleAgent(Agent):
+    """
+    An agent which picks the move maximizing the points gained plus the value of the
+    resulting afterstate (the board after the move, before a tile spawns), as estimated
+    by an n-tuple network. Networks are trained with agents.ntuple_training.
+    """
+
+    def __init__(
+        self, network: NTupleNetwork | str, rng: RandomSource | None = None
+    ) -> None:
+        """Initialize an agent with a network, or the path of a saved network."""
+        super().__init__(rng)
+        if isinstance(network, str):
+            network = NTupleNetwork.load(network)
+        self._network = network
+
+    def get_move(self, state: State) -> Moves:
+        """Return the move with the highest points plus afterstate value."""
+        return self.best_move(Bitboard.from_state(state).board)[0]
+
+    def best_move(self, board: int) -> tuple[Moves | None, int, int]:
+        """Return the best move on a packed board along with its afterstate and points
+        gained, or (None, BOARD, 0) if no move is legal."""
+        best = (None, board, 0)
+        best_score = float("-inf")
+        for move in Moves:
+            after, gained = execute_move(board, move)
+            if after != board:
+                score = gained + self._network.value(after)
+                if score > best_score:
+                    best, best_score = (move, after, gained), score
+        return best
+
+    @property
+    def network(self) -> NTupleNetwork:
+        return self._network
@@ -0,0 +1,105 @@
+import argparse
+from time import perf_counter
+
+from core.model import RandomStream, State
+from core.model.bitboard import Bitboard, empty_indices
+from core.model.rng import RandomSource
+
+from .ntuple_agent import DEFAULT_PATTERNS, NTupleAgent, NTupleNetwork
+
+parser = argparse.ArgumentParser(
+    description="Train an n-tuple network by temporal difference learning in self-play."
+)
+parser.add_argument(
+    "--episodes", type=int, default=10000, help="The number of games to train on."
+)
+parser.add_argument(
+    "--learning-rate",
+    type=float,
+    default=0.0025,
+    help="The TD(0) learning rate applied to every selected weight.",
+)
+parser.add_argument(
+    "--seed", type=int, default=0, help="The seed of the self-play games."
+)
+parser.add_argument(
+    "--resume", type=str, default=None, help="Continue training a saved network."
+)
+parser.add_argument(
+    "--output", type=str, default="ntuple.weights", help="Where to save the network."
+)
+parser.add_argument(
+    "--log-every", type=int, default=100, help="Print statistics every this many games."
+)
+
+
+def spawn(board: int, rng: RandomSource) -> int:
+    """Add a random tile to an empty cell of a packed board, weighted like State.add_tile."""
+    empty = empty_indices(board)
+    exponent = 1 if rng.random() < State.PROBABILITY_TWO else 2
+    return board | exponent << (4 * empty[int(rng.random() * len(empty))])
+
+
+def train_episode(
+    network: NTupleNetwork, learning_rate: float, rng: RandomSource
+) -> tuple[int, int]:
+    """Play one game greedily with respect to the network and learn from it with TD(0)
+    on afterstates: the value of every afterstate moves towards the points gained by the
+    next move plus the value of the next afterstate. Returns the score and max tile."""
+    agent = NTupleAgent(network)
+    board = spawn(spawn(0, rng), rng)
+    score = 0
+    previous = None
+    while True:
+        move, after, gained = agent.best_move(board)
+        if move is None:
+            break
+        if previous is not None:
+            error = gained + network.value(after) - network.value(previous)
+            network.update(previous, learning_rate * error)
+        score += gained
+        previous = after
+        board = spawn(after, rng)
+    if previous is not None:
+        network.update(previous, -learning_rate * network.value(previous))
+    return score, Bitboard(board).max
+
+
+def train(
+    network: NTupleNetwork,
+    episodes: int,
+    learning_rate: float,
+    rng: RandomSource,
+    log_every: int = 100,
+) -> None:
+    """Train a network on EPISODES self-play games, printing the mean score, the best
+    tile reached and the training speed every LOG_EVERY games."""
+    scores, max_tile = 0, 0
+    start = perf_counter()
+    for episode in range(1, episodes + 1):
+        score, tile = train_episode(network, learning_rate, rng)
+        scores += score
+        max_tile = max(max_tile, tile)
+        if episode % log_every == 0:
+            elapsed = perf_counter() - start
+            print(
+                f"Episode {episode}: mean score {scores / log_every:.0f}, "
+                f"max tile {max_tile}, {log_every / elapsed:.1f} games/s"
+            )
+            scores, max_tile = 0, 0
+            start = perf_counter()
+
+
+def main():
+    args = parser.parse_args()
+    if args.resume is not None:
+        network = NTupleNetwork.load(args.resume, memory_map=False)
+    else:
+        network = NTupleNetwork(DEFAULT_PATTERNS)
+    rng = RandomStream(args.seed)
+    train(network, args.episodes, args.learning_rate, rng, args.log_every)
+    network.save(args.output)
+
+
+if __name__ == "__main__":
+    main()
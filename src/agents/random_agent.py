@@ -1,4 +1,3 @@
-from random import choice
 from time import sleep
 
 from core.agent import Agent
@@ -11,4 +10,4 @@ class RandomAgent(Agent):
     def get_move(self, state: State) -> Moves:
         """Return a random legal move after a delay."""
         sleep(self.SLEEP_TIME)
-        return choice(state.legal_moves)
+        return self._rng.choice(state.legal_moves)
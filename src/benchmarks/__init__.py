@@ -0,0 +1,2 @@
+from .runner import BENCHMARKS, benchmark, run_benchmarks, compare
+from . import model, startup
@@ -0,0 +1,50 @@
+import argparse
+import sys
+
+from .runner import BENCHMARKS, compare, load, run_benchmarks, save
+
+parser = argparse.ArgumentParser(description="Benchmark the hot paths of the game.")
+parser.add_argument(
+    "--filter",
+    type=str,
+    default="",
+    help="Only run benchmarks whose name contains this string.",
+)
+parser.add_argument(
+    "--min-time",
+    type=float,
+    default=0.5,
+    help="The minimum number of seconds to run each benchmark for.",
+)
+parser.add_argument(
+    "--output", type=str, default=None, help="Save the results as JSON to this file."
+)
+parser.add_argument(
+    "--baseline",
+    type=str,
+    default=None,
+    help="Compare the results to a baseline JSON file saved with --output.",
+)
+parser.add_argument(
+    "--tolerance",
+    type=float,
+    default=0.1,
+    help="Slowdowns relative to the baseline above this fraction are regressions.",
+)
+
+
+def main():
+    args = parser.parse_args()
+    names = [name for name in BENCHMARKS if args.filter in name]
+    results = run_benchmarks(names, args.min_time)
+    if args.output is not None:
+        save(results, args.output)
+    if args.baseline is not None:
+        regressions = compare(results, load(args.baseline), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
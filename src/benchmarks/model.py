@@ -0,0 +1,211 @@
+from agents import RandomAgent
+from core import AgentGame, GridIndex, Moves, State
+from core.model import Board, RandomStream
+from core.model.grid import Grid
+
+from .runner import benchmark
+
+SEED = 2048
+NUM_STATES = 64
+NUM_GAMES = 5
+
+
+def copy_state(state: State) -> State:
+    """Return a copy of a state with its own grid."""
+    arr = [state[i] for i in range(state.grid.size)]
+    return State(Grid(arr, state.width, state.height), state.points, state.rng)
+
+
+def seeded_states(num_states: int = NUM_STATES) -> list[State]:
+    """Return a fixed list of states taken from seeded random games at varying depths,
+    so that boards range from nearly empty to nearly full."""
+    rng = RandomStream(SEED)
+    agent = RandomAgent(rng)
+    states = []
+    while len(states) < num_states:
+        state = State(rng=rng)
+        while not state.game_over and len(states) < num_states:
+            if rng.random() < 0.05:
+                states.append(copy_state(state))
+            state.make_move(agent.get_move(state))
+    return states
+
+
+def seeded_rows() -> list[list[int]]:
+    """Return all rows and columns of the seeded states, in every move direction."""
+    return [
+        [view[i] for i in range(len(view))]
+        for state in seeded_states()
+        for move in Moves
+        for view in state.views(move)
+    ]
+
+
+@benchmark("State.collapse_destructive")
+def bench_collapse_destructive():
+    rows = seeded_rows()
+
+    def run():
+        for row in rows:
+            State.collapse_destructive(row[:])
+
+    return run, len(rows)
+
+
+@benchmark("State.is_list_collapsible")
+def bench_is_list_collapsible():
+    views = [
+        view for state in seeded_states() for move in Moves for view in state.views(move)
+    ]
+
+    def run():
+        for view in views:
+            State.is_list_collapsible(view)
+
+    return run, len(views)
+
+
+@benchmark("State.legal_moves")
+def bench_legal_moves():
+    states = seeded_states()
+
+    def run():
+        for state in states:
+            state.legal_moves
+
+    return run, len(states)
+
+
+@benchmark("State.legal_mask[uncached]")
+def bench_legal_mask():
+    states = seeded_states()
+
+    def run():
+        for state in states:
+            state._legal_mask = None
+            state.legal_mask
+
+    return run, len(states)
+
+
+@benchmark("State.game_over[uncached]")
+def bench_game_over():
+    states = seeded_states()
+
+    def run():
+        for state in states:
+            state._legal_mask = None
+            state.game_over
+
+    return run, len(states)
+
+
+@benchmark("State.game_over[full]")
+def bench_game_over_full():
+    # Only full grids, which can't take the empty cell shortcut
+    states = [state for state in seeded_states(256) if not state.empty_count]
+
+    def run():
+        for state in states:
+            state._legal_mask = None
+            state.game_over
+
+    return run, len(states)
+
+
+@benchmark("State.collapse")
+def bench_collapse():
+    states = seeded_states()
+    moves = list(Moves)
+
+    def run():
+        # Collapse copies, so that the boards stay fixed
+        for state in states:
+            for move in moves:
+                state.copy().collapse(move)
+
+    return run, len(states) * len(moves)
+
+
+@benchmark("State.afterstates")
+def bench_afterstates():
+    states = seeded_states()
+
+    def run():
+        for state in states:
+            state.afterstates()
+
+    return run, len(states)
+
+
+@benchmark("State.afterstates[copy+collapse]")
+def bench_afterstates_by_copies():
+    # The same fan-out through a copy and a collapse per legal move, for comparison
+    states = seeded_states()
+
+    def run():
+        for state in states:
+            state._legal_mask = None
+            for move in state.legal_moves:
+                state.copy().collapse(move)
+
+    return run, len(states)
+
+
+@benchmark("Board.afterstates")
+def bench_board_afterstates():
+    # The same fan-out on immutable packed boards
+    boards = [Board.from_state(state) for state in seeded_states()]
+
+    def run():
+        for board in boards:
+            board.afterstates()
+
+    return run, len(boards)
+
+
+@benchmark("State.add_tile")
+def bench_add_tile():
+    states = [state for state in seeded_states() if state.grid.where(lambda x: x == 0)]
+
+    def run():
+        # Clear every spawned tile again, so that the boards stay fixed
+        for state in states:
+            state.add_tile()
+            state[state.last_spawn[0]] = 0
+
+    return run, len(states)
+
+
+@benchmark("Grid.where")
+def bench_where():
+    grids = [state.grid for state in seeded_states()]
+
+    def run():
+        for grid in grids:
+            grid.where(lambda x: x == 0)
+
+    return run, len(grids)
+
+
+@benchmark("Grid.__getitem__[GridIndex]")
+def bench_getitem():
+    grids = [state.grid for state in seeded_states()]
+    indices = [GridIndex(row, col) for row in range(4) for col in range(4)]
+
+    def run():
+        for grid in grids:
+            for idx in indices:
+                grid[idx]
+
+    return run, len(grids) * len(indices)
+
+
+@benchmark("Game.play[RandomAgent]")
+def bench_play():
+    def run():
+        for seed in range(NUM_GAMES):
+            agent = RandomAgent(RandomStream(2 * seed + 1))
+            AgentGame(agent, rng=RandomStream(2 * seed)).play()
+
+    return run, NUM_GAMES
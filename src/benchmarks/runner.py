@@ -0,0 +1,92 @@
+import json
+import platform
+import tracemalloc
+from time import perf_counter
+from typing import Callable
+
+# A benchmark is registered as a setup function, which prepares its inputs and returns
+# a function running one batch of operations along with the number of operations it runs.
+Setup = Callable[[], tuple[Callable[[], object], int]]
+
+BENCHMARKS: dict[str, Setup] = {}
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """Register a benchmark setup function under NAME."""
+
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def run_benchmark(setup: Setup, min_time: float = 0.5) -> dict:
+    """Run a benchmark for at least MIN_TIME seconds and return its operations per second,
+    along with the peak memory traced while running a single batch of operations."""
+    run, ops = setup()
+    run()  # Warm up lazily built tables and caches
+    batches = 0
+    start = perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        run()
+        batches += 1
+        elapsed = perf_counter() - start
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "ops_per_sec": batches * ops / elapsed,
+        "peak_bytes_per_batch": peak,
+        "ops_per_batch": ops,
+    }
+
+
+def run_benchmarks(names: list[str] | None = None, min_time: float = 0.5) -> dict:
+    """Run the benchmarks with the given names (all by default), printing each result
+    as it completes, and return all results along with details of the platform."""
+    results = {}
+    for name in names if names is not None else BENCHMARKS:
+        result = run_benchmark(BENCHMARKS[name], min_time)
+        results[name] = result
+        print(
+            f"{name:<32} {result['ops_per_sec']:>14,.1f} ops/s "
+            f"{result['peak_bytes_per_batch'] / 1024:>10,.1f} KiB peak "
+            f"({result['ops_per_batch']} ops/batch)"
+        )
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": results,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Compare results to a baseline and return the names of all benchmarks that are
+    slower than the baseline by more than TOLERANCE (a fraction of the baseline)."""
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        if name not in baseline["benchmarks"]:
+            continue
+        before = baseline["benchmarks"][name]["ops_per_sec"]
+        after = result["ops_per_sec"]
+        change = after / before - 1
+        flag = "REGRESSION" if change < -tolerance else ""
+        print(
+            f"{name:<32} {before:>14,.1f} -> {after:>14,.1f} ops/s {change:>+8.1%} {flag}"
+        )
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def save(results: dict, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
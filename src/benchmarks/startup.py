@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+from .runner import benchmark
+
+# The directory holding main.py, which is also the root of all imports
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NUM_LAUNCHES = 5
+
+
+def launch(*args: str) -> None:
+    """Run a fresh interpreter from the source directory and wait for it to exit."""
+    subprocess.run(
+        [sys.executable, *args], cwd=SRC, stdout=subprocess.DEVNULL, check=True
+    )
+
+
+@benchmark("python startup")
+def bench_python_startup():
+    # The baseline cost of launching an interpreter, which main.py can't go below
+    def run():
+        for _ in range(NUM_LAUNCHES):
+            launch("-c", "pass")
+
+    return run, NUM_LAUNCHES
+
+
+@benchmark("main.py startup")
+def bench_main_startup():
+    # Parsing --help imports everything main.py imports at module level, then exits
+    def run():
+        for _ in range(NUM_LAUNCHES):
+            launch("main.py", "--help")
+
+    return run, NUM_LAUNCHES
+
+
+@benchmark("simulate.py worker imports")
+def bench_worker_imports():
+    def run():
+        for _ in range(NUM_LAUNCHES):
+            launch("-c", "import simulate; simulate.make_agent('random')")
+
+    return run, NUM_LAUNCHES
@@ -1,4 +1,5 @@
 from .model import State, Moves, GridIndex
-from .game import Game
+from .game import Game, AgentGame
+from .profiling import Profiler
 from .view import View
 from .controller import Controller
@@ -1,13 +1,30 @@
 from abc import ABC, abstractmethod
+from random import Random
 
 from .model import Moves, State
+from .model.rng import RandomSource
 
 
 class Agent(ABC):
     """Abstract class that captures an agent, which decides, based on some
     strategy and with information of a game state, what move to make next."""
 
+    def __init__(self, rng: RandomSource | None = None) -> None:
+        """Initialize an agent with an optional random number generator, such as a seeded
+        random.Random or a RandomStream, which is used by randomized strategies."""
+        self._rng = rng if rng is not None else Random()
+
+    @property
+    def rng(self) -> RandomSource:
+        """The random number generator of this agent."""
+        return self._rng
+
     @abstractmethod
     def get_move(self, state: State) -> Moves:
         """Given a game state, return a legal move by some strategy."""
         pass
+
+    def close(self) -> None:
+        """Release any resources held by the agent, such as worker pools. Called once
+        the agent has played its last move."""
+        pass
@@ -1,25 +1,75 @@
+from threading import Event as Flag, Thread
+
 from .agent import Agent
-from .event import KeyPressEvent
+from .event import Event, KeyPressEvent, QuitEvent
+from .event_loop import EventQueue, StateChannel, run_events
 from .model import Moves, State
 from .observer import Observer
 from .view import View
 
 
 class Controller(Observer):
-    def __init__(self, state: State, view: View, agent: Agent) -> None:
+    """
+    Connects a state, a view displaying it and an optional agent playing it. Events
+    from the view are queued and handled on a separate thread, and the agent computes
+    its moves on yet another thread, so that neither the view nor the agent ever waits
+    for the other. The view samples the state from a StateChannel at its own rate.
+    """
+
+    def __init__(self, state: State, view: View, agent: Agent | None = None) -> None:
         self._state = state
         self._view = view
         view.attach(self)
         self._agent = agent
+        self._channel = StateChannel(state)
+        self._events = EventQueue()
+        self._stopped = Flag()
 
     def play(self) -> None:
-        self._view.display(self._state)
+        """Display the game until the view returns, while handling events and playing
+        the agent's moves in the background."""
+        threads = [Thread(target=run_events, args=(self._events, self.handle))]
+        if self._agent is not None:
+            threads.append(Thread(target=self.play_agent))
+        for thread in threads:
+            thread.start()
+        try:
+            self._view.display(self._channel)
+        finally:
+            self._stopped.set()
+            self._channel.close()
+            self._events.put(QuitEvent())
+            self._events.close()
+            for thread in threads:
+                thread.join()
+            if self._agent is not None:
+                self._agent.close()
 
     def update(self, event):
+        """Queue an event from the view, without waiting for it to be handled."""
+        self._events.put(event)
+
+    def handle(self, event: Event) -> bool:
+        """Handle an event on the event thread. Returns false iff handling should stop."""
+        if isinstance(event, QuitEvent):
+            self._stopped.set()
+            self._channel.close()
+            return False
         if isinstance(event, KeyPressEvent):
             parsed_move = parse_move(event.key)
-            if parsed_move in self._state.legal_moves:
-                self._state.make_move(parsed_move)
+            if parsed_move is not None:
+                self._channel.make_move(parsed_move)
+        return True
+
+    def play_agent(self) -> None:
+        """Let the agent play moves as fast as it can, until the game ends or stops."""
+        while not self._stopped.is_set() and not self._channel.closed:
+            move = self._agent.get_move(self._channel.copy())
+            self._channel.make_move(move)
+
+    @property
+    def channel(self) -> StateChannel:
+        return self._channel
 
 
 def parse_move(user_input: str):
@@ -2,7 +2,10 @@ from abc import ABC
 
 
 class Event(ABC):
-    pass
+    def coalesces_with(self, other: "Event") -> bool:
+        """Returns true iff this event is redundant when it directly follows the pending
+        event OTHER, so that it can be dropped from an event queue."""
+        return False
 
 
 class KeyPressEvent(Event):
@@ -13,3 +16,10 @@ class KeyPressEvent(Event):
     @property
     def key(self):
         return self._key
+
+
+class QuitEvent(Event):
+    # Key presses are never coalesced, since pressing a key twice is two moves. Only a
+    # repeated request to quit is redundant
+    def coalesces_with(self, other: Event) -> bool:
+        return isinstance(other, QuitEvent)
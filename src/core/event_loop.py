@@ -0,0 +1,110 @@
+from collections import deque
+from threading import Condition, Lock
+from typing import Callable
+
+from .event import Event
+from .model import Moves, State
+
+
+class EventQueue:
+    """
+    A thread-safe first in, first out queue of events. An event which coalesces with
+    the last pending event is dropped, so that bursts of redundant events are handled
+    once. Putting an event never blocks.
+    """
+
+    def __init__(self) -> None:
+        self._events: deque[Event] = deque()
+        self._condition = Condition()
+        self._closed = False
+
+    def put(self, event: Event) -> None:
+        with self._condition:
+            if self._events and event.coalesces_with(self._events[-1]):
+                return
+            self._events.append(event)
+            self._condition.notify()
+
+    def get(self, timeout: float | None = None) -> Event | None:
+        """Return the next event, waiting up to TIMEOUT seconds (forever by default) for
+        one to arrive. Returns None on timeout or once the queue is closed and empty."""
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._events or self._closed, timeout
+            ):
+                return None
+            return self._events.popleft() if self._events else None
+
+    def close(self) -> None:
+        """Wake up all waiting consumers. Pending events can still be taken."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+class StateChannel:
+    """
+    Shares a state between the thread making moves and the threads displaying it. Every
+    move is made under a lock and bumps a version number, while readers sample copies of
+    the state at their own rate. A copy is only made when the state changed since the
+    last sample, so sampling an idle game is free, and the game never waits for a view.
+    """
+
+    def __init__(self, state: State) -> None:
+        self._state = state
+        self._lock = Lock()
+        self._version = 0
+        self._sample = state.copy()
+        self._sample_version = 0
+        self._closed = False
+
+    def make_move(self, move: Moves) -> bool:
+        """Make a move if it is legal, returning true iff it was made."""
+        with self._lock:
+            if not self._state.is_legal(move):
+                return False
+            self._state.make_move(move)
+            self._version += 1
+        return True
+
+    def copy(self) -> State:
+        """Return a private copy of the current state, for example for an agent."""
+        with self._lock:
+            return self._state.copy()
+
+    def sample(self) -> State:
+        """Return a copy of the current state, which must not be modified. The same copy
+        is returned until the state changes."""
+        with self._lock:
+            if self._sample_version != self._version:
+                self._sample = self._state.copy()
+                self._sample_version = self._version
+            return self._sample
+
+    def close(self) -> None:
+        """Mark the game as over for all readers, for example when the user quits."""
+        self._closed = True
+
+    @property
+    def closed(self) -> bool:
+        """Returns true iff the game was closed or is over."""
+        if self._closed:
+            return True
+        with self._lock:
+            return self._state.game_over
+
+    @property
+    def version(self) -> int:
+        """The number of moves made through this channel."""
+        return self._version
+
+
+def run_events(queue: EventQueue, handle: Callable[[Event], bool]) -> None:
+    """Pass events from a queue to HANDLE until it returns false or the queue closes."""
+    while True:
+        event = queue.get()
+        if event is None or not handle(event):
+            return
@@ -1,18 +1,33 @@
+from .agent import Agent
 from .model import Moves, State
+from .model.rng import RandomSource
+from .profiling import Profiler
 from abc import ABC, abstractmethod
+from time import perf_counter
 
 
 class Game(ABC):
     """A class for playing and interacting with a game of 2048."""
 
-    def __init__(self, state: State | None = None) -> None:
+    def __init__(
+        self,
+        state: State | None = None,
+        rng: RandomSource | None = None,
+        profiler: Profiler | None = None,
+    ) -> None:
         """An instance of a 2048 game. Can optionally be instantiated
-        with a state instance to start from any configuration desired."""
+        with a state instance to start from any configuration desired.
+        If no state is given, a new state is created which spawns its
+        tiles from the optional random number generator RNG. If a PROFILER
+        is given, every phase of every move played is timed by it."""
         if state is None:
-            state = State()
+            state = State(rng=rng)
         self._state = state
         self._has_won = state.won
         self._prev_won = state.won
+        self._num_moves = 0
+        self._last_move: Moves | None = None
+        self._profiler = profiler
 
     @abstractmethod
     def get_move(self) -> Moves:
@@ -58,20 +73,54 @@ class Game(ABC):
                 else:
                     self.do_after_win()
             self.do_before_every_move()
-            move = self.get_move()
-            self.make_move(move)
+            self.make_move(self.next_move())
             self.do_after_every_move()
         self.do_on_game_over()
+        if self._profiler is not None:
+            self._profiler.record_game(self._state)
+
+    def next_move(self) -> Moves:
+        """Return the move chosen by get_move, timing it if I'm profiled."""
+        profiler = self._profiler
+        if profiler is None:
+            return self.get_move()
+        start = perf_counter()
+        move = self.get_move()
+        profiler.record("get_move", perf_counter() - start)
+        return move
 
     def make_move(self, move: Moves):
-        """Apply a move to my state."""
-        self._state.make_move(move)
+        """Apply a move to my state. If I'm profiled, the move (including its legality
+        check) and the tile spawn are timed separately."""
+        profiler = self._profiler
+        if profiler is None:
+            self._state.make_move(move)
+        else:
+            start = perf_counter()
+            self._state.make_move(move, add_tile=False)
+            moved = perf_counter()
+            self._state.add_tile()
+            profiler.record("make_move", moved - start)
+            profiler.record("add_tile", perf_counter() - moved)
+            profiler.record_move(move)
+        self._num_moves += 1
+        self._last_move = move
 
     @property
     def state(self):
         """Return the state associated with this game."""
         return self._state
 
+    @property
+    def last_move(self):
+        """Return the most recently made move, or None if no move was made yet."""
+        return self._last_move
+
+    @property
+    def num_moves(self):
+        """Return the number of moves made in this game so far."""
+        return self._num_moves
+
     @property
     def legal_moves(self):
         """Return a list of legal moves for the current game state."""
@@ -79,8 +128,14 @@ class Game(ABC):
 
     @property
     def game_over(self):
-        """Returns true iff the game is over."""
-        return self._state.game_over
+        """Returns true iff the game is over. If I'm profiled, the check is timed."""
+        profiler = self._profiler
+        if profiler is None:
+            return self._state.game_over
+        start = perf_counter()
+        over = self._state.game_over
+        profiler.record("game_over", perf_counter() - start)
+        return over
 
     @property
     def won(self):
@@ -88,6 +143,11 @@ class Game(ABC):
         this doesn't mean the game ends."""
         return self._state.won
 
+    @property
+    def profiler(self):
+        """Return the profiler timing this game, or None if the game is not profiled."""
+        return self._profiler
+
     @property
     def prev_won(self):
         """Returns true iff the game reached a winning state before this turn."""
@@ -95,3 +155,26 @@ class Game(ABC):
 
     def __str__(self) -> str:
         return str(self._state)
+
+
+class AgentGame(Game):
+    """A game of 2048 in which every move is chosen by an agent, without any display."""
+
+    def __init__(
+        self,
+        agent: Agent,
+        state: State | None = None,
+        rng: RandomSource | None = None,
+        profiler: Profiler | None = None,
+    ) -> None:
+        super().__init__(state, rng, profiler)
+        self._agent = agent
+
+    def get_move(self) -> Moves:
+        """Return the move chosen by my agent for the current state."""
+        return self._agent.get_move(self._state)
+
+    @property
+    def agent(self):
+        """The agent playing this game."""
+        return self._agent
@@ -2,3 +2,7 @@
 from .state import State
 from .moves import Moves
 from .grid_index import GridIndex
+from .bitboard import Bitboard
+from .board import Board
+from .rng import RandomStream
+from .symmetry import Symmetry
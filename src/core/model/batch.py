@@ -0,0 +1,222 @@
+from __future__ import annotations
+from typing import Sequence
+
+import numpy as np
+
+from .grid import Grid
+from .moves import Moves
+from .state import State
+
+MOVES = list(Moves)
+
+
+def _oriented(boards: np.ndarray, move: Moves) -> np.ndarray:
+    """Return a view of BOARDS (of shape (N, H, W)) in which MOVE becomes a move to the
+    left, that is, each line of the last axis collapses towards its first entry. Writing
+    to the view writes through to the boards."""
+    if move is Moves.LEFT:
+        return boards
+    if move is Moves.RIGHT:
+        return boards[:, :, ::-1]
+    if move is Moves.UP:
+        return boards.transpose(0, 2, 1)
+    return boards.transpose(0, 2, 1)[:, :, ::-1]
+
+
+def _shift_left(lines: np.ndarray) -> np.ndarray:
+    """Shift all non-zero entries of each line to the left, keeping their order."""
+    order = np.argsort(lines == 0, axis=1, kind="stable")
+    return np.take_along_axis(lines, order, axis=1)
+
+
+def collapse_lines(lines: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Collapse every line (row) of a 2d array to the left, following the same rules
+    as State.collapse_destructive. Returns the collapsed lines and the points gained
+    by each line. Since merged tiles leave a zero behind, a single left to right pass
+    over adjacent pairs never merges a tile twice."""
+    lines = _shift_left(lines)
+    points = np.zeros(len(lines), dtype=np.int64)
+    for j in range(lines.shape[1] - 1):
+        merge = (lines[:, j] != 0) & (lines[:, j] == lines[:, j + 1])
+        lines[merge, j] *= 2
+        lines[merge, j + 1] = 0
+        points += np.where(merge, lines[:, j], 0)
+    return _shift_left(lines), points
+
+
+def collapsible_lines(boards: np.ndarray) -> np.ndarray:
+    """Return a boolean array of shape (N,) which is true where any line of the
+    corresponding board is collapsible to the left."""
+    first, second = boards[:, :, :-1], boards[:, :, 1:]
+    slides = (first == 0) & (second != 0)
+    merges = (first != 0) & (first == second)
+    return (slides | merges).any(axis=(1, 2))
+
+
+class BatchState:
+    """
+    A batch of N independent games of 2048, stored as a single (N, H, W) integer array
+    of tile values. All operations act on every board at once using NumPy, so stepping
+    thousands of games costs a handful of array operations rather than thousands of
+    State method calls. Follows the same rules, spawn weights and points as State.
+    """
+
+    PROBABILITY_TWO: float = State.PROBABILITY_TWO
+    PROBABILITY_FOUR: float = State.PROBABILITY_FOUR
+
+    def __init__(
+        self,
+        num_boards: int | None = None,
+        boards: np.ndarray | None = None,
+        width: int = State.WIDTH,
+        height: int = State.HEIGHT,
+        rng: np.random.Generator | None = None,
+    ) -> None:
+        """
+        Initialize a batch of games.
+
+        Args:
+            num_boards: The number of games to create, each starting with two random tiles.
+            Ignored if BOARDS is given.
+            boards: An optional (N, H, W) array of tile values to start from.
+            width: The width of newly created boards.
+            height: The height of newly created boards.
+            rng: An optional NumPy random generator used for spawning tiles.
+        """
+        self._rng = rng if rng is not None else np.random.default_rng()
+        if boards is None:
+            if num_boards is None:
+                raise ValueError("Either num_boards or boards must be given.")
+            self._boards = np.zeros((num_boards, height, width), dtype=np.int32)
+            self.add_tile(num_tiles=2)
+        else:
+            self._boards = np.array(boards, dtype=np.int32)
+        self._points = np.zeros(len(self._boards), dtype=np.int64)
+
+    @classmethod
+    def from_states(
+        cls, states: Sequence[State], rng: np.random.Generator | None = None
+    ) -> BatchState:
+        """Create a batch from a sequence of equally sized State instances."""
+        boards = np.array(
+            [[state[i] for i in range(state.width * state.height)] for state in states],
+            dtype=np.int32,
+        ).reshape(len(states), states[0].height, states[0].width)
+        batch = cls(boards=boards, rng=rng)
+        batch._points[:] = [state.points for state in states]
+        return batch
+
+    def to_state(self, index: int) -> State:
+        """Return the board at INDEX as a regular State instance."""
+        board = self._boards[index]
+        grid = Grid(board.ravel().tolist(), width=self.width, height=self.height)
+        return State(grid, int(self._points[index]))
+
+    @staticmethod
+    def move_indices(moves: Sequence[Moves] | np.ndarray) -> np.ndarray:
+        """Convert a sequence of moves into an integer array of indices into Moves."""
+        if isinstance(moves, np.ndarray):
+            return moves.astype(np.intp)
+        return np.fromiter((MOVES.index(move) for move in moves), dtype=np.intp)
+
+    def legal_mask(self) -> np.ndarray:
+        """Return a boolean array of shape (N, 4), which is true where the move (in the
+        order of Moves) is legal for the corresponding board."""
+        return np.stack(
+            [collapsible_lines(_oriented(self._boards, move)) for move in MOVES], axis=1
+        )
+
+    def collapse(
+        self, moves: Sequence[Moves] | np.ndarray, mask: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Collapse every board selected by MASK (all boards by default) in the direction
+        of its move. Returns the points gained by each board, which are also added to the
+        accrued points."""
+        indices = self.move_indices(moves)
+        if mask is not None:
+            indices = np.where(mask, indices, -1)
+        points = np.zeros(len(self._boards), dtype=np.int64)
+        for i, move in enumerate(MOVES):
+            selected = np.flatnonzero(indices == i)
+            if len(selected) == 0:
+                continue
+            boards = self._boards[selected]
+            oriented = _oriented(boards, move)
+            lines, gained = collapse_lines(oriented.reshape(-1, oriented.shape[2]))
+            oriented[...] = lines.reshape(oriented.shape)
+            self._boards[selected] = boards
+            points[selected] = gained.reshape(len(selected), -1).sum(axis=1)
+        self._points += points
+        return points
+
+    def add_tile(self, num_tiles: int = 1, mask: np.ndarray | None = None) -> None:
+        """Add random tile(s) (either a 2 or a 4), weighted accordingly, to an empty
+        position of every board selected by MASK (all boards by default). Boards
+        without an empty position are left unchanged."""
+        flat = self._boards.reshape(len(self._boards), -1)
+        if mask is None:
+            mask = np.ones(len(flat), dtype=bool)
+        rows = np.arange(len(flat))
+        for _ in range(num_tiles):
+            empty = flat == 0
+            # The position of the largest random key among empty cells is uniform
+            keys = np.where(empty, self._rng.random(flat.shape), -1.0)
+            index = keys.argmax(axis=1)
+            vals = np.where(self._rng.random(len(flat)) < self.PROBABILITY_TWO, 2, 4)
+            spawn = mask & empty.any(axis=1)
+            flat[rows[spawn], index[spawn]] = vals[spawn]
+
+    def step(
+        self, moves: Sequence[Moves] | np.ndarray, add_tile: bool = True
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Apply one move to every board and spawn a tile on every board that changed.
+        Illegal moves leave their board unchanged and gain no points.
+
+        Returns:
+            A copy of the new (N, H, W) boards, which later steps don't change, the
+            points gained by each board, the (N, 4) legal move masks of the new boards
+            and a boolean array which is true for every board on which the game is over.
+        """
+        indices = self.move_indices(moves)
+        moved = self.legal_mask()[np.arange(len(self._boards)), indices]
+        points = self.collapse(indices, mask=moved)
+        if add_tile:
+            self.add_tile(mask=moved)
+        legal_mask = self.legal_mask()
+        return self._boards.copy(), points, legal_mask, ~legal_mask.any(axis=1)
+
+    def reset(self, mask: np.ndarray) -> None:
+        """Restart every game selected by MASK from an empty board with two random tiles."""
+        self._boards[mask] = 0
+        self._points[mask] = 0
+        self.add_tile(num_tiles=2, mask=mask)
+
+    @property
+    def game_over(self) -> np.ndarray:
+        """A boolean array which is true for every board on which the game is over."""
+        return ~self.legal_mask().any(axis=1)
+
+    @property
+    def boards(self) -> np.ndarray:
+        """The (N, H, W) array of tile values."""
+        return self._boards
+
+    @property
+    def points(self) -> np.ndarray:
+        """The number of points accrued by each board."""
+        return self._points
+
+    @property
+    def width(self) -> int:
+        return self._boards.shape[2]
+
+    @property
+    def height(self) -> int:
+        return self._boards.shape[1]
+
+    def __len__(self) -> int:
+        return len(self._boards)
+
+    def __repr__(self) -> str:
+        return f"<{__class__.__name__}(num_boards={len(self)}, width={self.width}, height={self.height})"
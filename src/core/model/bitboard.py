@@ -0,0 +1,322 @@
+from __future__ import annotations
+from random import Random
+
+from .grid import Grid
+from .grid_index import GridIndex
+from .line_table import NUM_ROWS, ROW_MASK, row_tables as _row_tables
+from .moves import Moves
+from .rng import RandomSource
+from .state import State
+from .symmetry import IDENTITY, Symmetry
+
+# The move tables of line_table, bound here on first use so that execute_move looks
+# them up as globals of this module.
+_row_left: list[int] | None = None
+_row_right: list[int] | None = None
+_col_up: list[int] | None = None
+_col_down: list[int] | None = None
+_row_points: list[int] | None = None
+
+
+def row_tables(path: str | None = None) -> tuple[list[int], ...]:
+    """Return the (left, right, up, down, points) move tables, building them on first
+    use, or loading them from PATH if given (see line_table.row_tables)."""
+    global _row_left, _row_right, _col_up, _col_down, _row_points
+    if _row_left is None:
+        _row_left, _row_right, _col_up, _col_down, _row_points = _row_tables(path)
+    return _row_left, _row_right, _col_up, _col_down, _row_points
+
+
+def transpose(board: int) -> int:
+    """Transpose a packed board, swapping its rows and columns."""
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def execute_move(board: int, move: Moves) -> tuple[int, int]:
+    """Return the packed board after applying MOVE to BOARD, along with the points
+    gained. Column moves are handled by transposing the board, so that its columns
+    can be looked up as rows, and writing the results back as columns."""
+    if _row_left is None:
+        row_tables()
+    points = _row_points
+    if move is Moves.LEFT or move is Moves.RIGHT:
+        table = _row_left if move is Moves.LEFT else _row_right
+        r0 = board & ROW_MASK
+        r1 = (board >> 16) & ROW_MASK
+        r2 = (board >> 32) & ROW_MASK
+        r3 = board >> 48
+        result = table[r0] | table[r1] << 16 | table[r2] << 32 | table[r3] << 48
+    else:
+        table = _col_up if move is Moves.UP else _col_down
+        t = transpose(board)
+        r0 = t & ROW_MASK
+        r1 = (t >> 16) & ROW_MASK
+        r2 = (t >> 32) & ROW_MASK
+        r3 = t >> 48
+        result = table[r0] | table[r1] << 4 | table[r2] << 8 | table[r3] << 12
+    return result, points[r0] + points[r1] + points[r2] + points[r3]
+
+
+def flip_board_rows(board: int) -> int:
+    """Reverse the order of the rows of a packed 4x4 board."""
+    return (
+        (board & 0xFFFF) << 48
+        | (board & 0xFFFF0000) << 16
+        | (board >> 16) & 0xFFFF0000
+        | board >> 48
+    )
+
+
+def flip_board_cols(board: int) -> int:
+    """Reverse the order of the columns of a packed 4x4 board."""
+    return (
+        (board & 0x000F000F000F000F) << 12
+        | (board & 0x00F000F000F000F0) << 4
+        | (board & 0x0F000F000F000F00) >> 4
+        | (board & 0xF000F000F000F000) >> 12
+    )
+
+
+def canonical_board(board: int) -> tuple[int, Symmetry]:
+    """Return the canonical packed board among all rotations and reflections of a packed
+    4x4 board, along with the symmetry mapping the board to its canonical orientation."""
+    best_board, best_symmetry = board, IDENTITY
+    for is_transposed, base in ((False, board), (True, transpose(board))):
+        flipped_rows = flip_board_rows(base)
+        for symmetry, candidate in (
+            (Symmetry(is_transposed, False, False), base),
+            (Symmetry(is_transposed, False, True), flip_board_cols(base)),
+            (Symmetry(is_transposed, True, False), flipped_rows),
+            (Symmetry(is_transposed, True, True), flip_board_cols(flipped_rows)),
+        ):
+            if candidate < best_board:
+                best_board, best_symmetry = candidate, symmetry
+    return best_board, best_symmetry
+
+
+# The lowest bit of every nibble, of the nibbles whose right neighbour is in the same
+# row, and of the nibbles of the top three rows
+NIBBLES = 0x1111_1111_1111_1111
+ROW_PAIRS = 0x0111_0111_0111_0111
+COL_PAIRS = 0x0000_1111_1111_1111
+
+
+def nonzero_nibbles(board: int) -> int:
+    """Return the lowest bit of every nonzero nibble of a packed board."""
+    return (board | board >> 1 | board >> 2 | board >> 3) & NIBBLES
+
+
+def has_moves(board: int) -> bool:
+    """Returns true iff any move changes a packed board, without executing any move: a
+    board with both tiles and empty cells always has a legal move, and a full board has
+    one iff two adjacent tiles below 2^15 are equal (tiles of 2^15 never merge, see
+    line_table). Equal tiles show as a zero nibble in the exclusive or of the board and
+    the board shifted by one cell or one row."""
+    occupied = nonzero_nibbles(board)
+    if occupied != NIBBLES:
+        return occupied != 0
+    mergeable = ~(board & board >> 1 & board >> 2 & board >> 3) & NIBBLES
+    if ~nonzero_nibbles(board ^ board >> 4) & ROW_PAIRS & mergeable:
+        return True
+    return bool(~nonzero_nibbles(board ^ board >> 16) & COL_PAIRS & mergeable)
+
+
+def empty_indices(board: int) -> list[int]:
+    """Return the linear indices of all empty cells of a packed board."""
+    return [i for i in range(16) if not (board >> (4 * i)) & 0xF]
+
+
+def tile_exponent(val: int) -> int:
+    """Return the nibble of a tile value: 0 for an empty cell and e for a tile of 2^e.
+    Raises a ValueError for values other than zero and powers of two from 2 to 2^15,
+    which don't fit into a nibble."""
+    if not val:
+        return 0
+    e = val.bit_length() - 1
+    if val != 1 << e or not 0 < e < 16:
+        raise ValueError(f"Can't pack a tile value of {val}.")
+    return e
+
+
+def encode(values: list[int]) -> int:
+    """Pack a list of 16 tile values (zero or powers of two from 2 to 2^15) into a
+    board. Raises a ValueError for any other value, which doesn't fit into a nibble."""
+    board = 0
+    for i, val in enumerate(values):
+        board |= tile_exponent(val) << (4 * i)
+    return board
+
+
+def decode(board: int) -> list[int]:
+    """Unpack a board into a list of 16 tile values."""
+    values = []
+    for i in range(16):
+        exponent = (board >> (4 * i)) & 0xF
+        values.append(1 << exponent if exponent else 0)
+    return values
+
+
+class Bitboard:
+    """
+    An alternative backend for 4x4 game states, packing the whole grid into a single
+    64-bit integer of 4-bit tile exponents (a value of 2^e is stored as e, an empty cell
+    as 0). Row nibbles are stored in linear index order, so cell i lives in bits 4i..4i+3.
+
+    Moves are answered with lookups into precomputed tables of all 65,536 possible rows,
+    which makes this backend orders of magnitude faster than State for simulation and
+    search, at the cost of only supporting 4x4 grids with tiles up to 2^15.
+    """
+
+    WIDTH = 4
+    HEIGHT = 4
+    SIZE = WIDTH * HEIGHT
+    PROBABILITY_TWO: float = 0.9
+    PROBABILITY_FOUR: float = 0.1
+    WIN_THRESHOLD: int = 2048
+
+    def __init__(
+        self,
+        board: int | None = None,
+        points: int = 0,
+        rng: RandomSource | None = None,
+    ) -> None:
+        """
+        Initialize a bitboard state.
+
+        Args:
+            board: An optional packed board. By default, a board with only two tiles is created.
+            points: The number of accrued points. Defaults to zero.
+            rng: An optional random number generator used to spawn tiles.
+        """
+        self._rng = rng if rng is not None else Random()
+        if board is None:
+            self._board = 0
+            self.add_tile(num_tiles=2)
+        else:
+            self._board = board
+        self._points = points
+
+    @classmethod
+    def from_state(cls, state: State) -> Bitboard:
+        """Create a bitboard from a 4x4 State instance, sharing its random number generator.
+        Raises a ValueError if the state has a tile above 2^15."""
+        if state.width != cls.WIDTH or state.height != cls.HEIGHT:
+            raise ValueError("Bitboards only support 4x4 grids.")
+        board = encode([state[i] for i in range(cls.SIZE)])
+        return cls(board, state.points, state.rng)
+
+    def to_state(self) -> State:
+        """Convert this bitboard to a regular State instance, sharing its random number generator."""
+        return State(Grid(decode(self._board)), self._points, self._rng)
+
+    def add_tile(self, num_tiles=1):
+        """Add random tile(s) (either a 2 or a 4), weighted accordingly, to an empty position of the board."""
+        rand = self._rng.random
+        for _ in range(num_tiles):
+            empty = empty_indices(self._board)
+            index = empty[int(rand() * len(empty))]
+            exponent = 1 if rand() < self.PROBABILITY_TWO else 2
+            self._board |= exponent << (4 * index)
+
+    def __getitem__(self, idx: GridIndex | int) -> int:
+        """Get the tile value at a grid index (row and column) or a linear index."""
+        if isinstance(idx, GridIndex):
+            idx = self.WIDTH * idx.row + idx.col
+        exponent = (self._board >> (4 * idx)) & 0xF
+        return 1 << exponent if exponent else 0
+
+    def __setitem__(self, idx: GridIndex | int, val: int) -> None:
+        """Set the tile value at a grid index (row and column) or a linear index."""
+        if isinstance(idx, GridIndex):
+            idx = self.WIDTH * idx.row + idx.col
+        nibble = tile_exponent(val)
+        shift = 4 * idx
+        self._board = (self._board & ~(0xF << shift)) | (nibble << shift)
+
+    def make_move(self, move: Moves, add_tile: bool = True):
+        """Apply a move to the state, collapsing the grid in the appropriate direction
+        and then adding a tile randomly to an empty position if ADD_TILE is true."""
+        board, points = execute_move(self._board, move)
+        if board == self._board:
+            raise Exception("Attempting to make an illegal move.")
+        self._board = board
+        self._points += points
+        if add_tile:
+            self.add_tile()
+
+    def collapse(self, move: Moves):
+        """Collapse the grid in a given direction."""
+        self._board, points = execute_move(self._board, move)
+        self._points += points
+
+    def canonical_key(self) -> tuple[int, Symmetry]:
+        """Return the canonical packed board among all rotations and reflections of my
+        board, along with the symmetry mapping my board to its canonical orientation."""
+        return canonical_board(self._board)
+
+    def collapsible_by_move(self, move: Moves) -> bool:
+        """Returns true iff the grid is collapsible in a given move direction."""
+        return execute_move(self._board, move)[0] != self._board
+
+    @property
+    def legal_moves(self) -> list[Moves]:
+        """Return a list of all legal moves given the current game state."""
+        return [move for move in Moves if self.collapsible_by_move(move)]
+
+    @property
+    def game_over(self) -> bool:
+        """Returns true iff the game is over, which is the case when no
+        more legal moves are available."""
+        return not has_moves(self._board)
+
+    @property
+    def won(self) -> bool:
+        return self.max > self.WIN_THRESHOLD
+
+    @property
+    def max(self) -> int:
+        """Return the largest tile on the board."""
+        return max(decode(self._board))
+
+    @property
+    def width(self) -> int:
+        return self.WIDTH
+
+    @property
+    def height(self) -> int:
+        return self.HEIGHT
+
+    @property
+    def board(self) -> int:
+        """The packed 64-bit board."""
+        return self._board
+
+    @property
+    def points(self) -> int:
+        """Returns the current number of points accrued."""
+        return self._points
+
+    @property
+    def grid(self) -> Grid:
+        """A Grid instance with the same tiles as this board. Note that mutating the
+        returned grid does not affect the board."""
+        return Grid(decode(self._board))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Bitboard):
+            return self._board == other._board and self._points == other._points
+        return super().__eq__(other)
+
+    def __str__(self) -> str:
+        """Return a readable representation of the state."""
+        return f"Points: {self.points}\n{self.grid}"
+
+    def __repr__(self) -> str:
+        return f"<{__class__.__name__}(board={self._board:#018x}, points={self.points})"
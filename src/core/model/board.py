@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from .bitboard import (
+    Bitboard,
+    canonical_board,
+    decode,
+    empty_indices,
+    encode,
+    execute_move,
+    has_moves,
+    tile_exponent,
+)
+from .grid import Grid
+from .grid_index import GridIndex
+from .moves import Moves
+from .rng import RandomSource
+from .state import State
+from .symmetry import Symmetry
+
+MOVES = tuple(Moves)
+
+
+class Board(int):
+    """
+    An immutable, hashable 4x4 board: a packed bitboard (see Bitboard) which is itself an
+    int. Boards have no instance dictionary, so a stored position takes about as much
+    memory as a 64-bit integer (around 50 bytes, against several hundred for a State
+    with its grid), and they can be used directly as dictionary keys or set members. A
+    board equals (and hashes like) its packed integer, so it can be mixed with the raw
+    boards returned by execute_move. Moves return new boards.
+    """
+
+    __slots__ = ()
+
+    WIDTH = 4
+    HEIGHT = 4
+    SIZE = WIDTH * HEIGHT
+
+    @classmethod
+    def from_values(cls, values: list[int]) -> Board:
+        """Create a board from a list of 16 tile values (zero or powers of two up to 2^15)."""
+        if len(values) != cls.SIZE:
+            raise ValueError(f"Expected {cls.SIZE} tile values, got {len(values)}.")
+        return cls(encode(values))
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> Board:
+        if grid.width != cls.WIDTH or grid.height != cls.HEIGHT:
+            raise ValueError("Boards only support 4x4 grids.")
+        return cls.from_values(grid.to_list())
+
+    @classmethod
+    def from_state(cls, state: State) -> Board:
+        """Create a board from the grid of a 4x4 state. The points of the state are not
+        part of the board."""
+        return cls.from_grid(state.grid)
+
+    @classmethod
+    def from_bitboard(cls, bitboard: Bitboard) -> Board:
+        return cls(bitboard.board)
+
+    def to_grid(self) -> Grid:
+        return Grid(decode(self))
+
+    def to_state(self, points: int = 0, rng: RandomSource | None = None) -> State:
+        """Return a new State of this board with the given points and random number generator."""
+        return State(self.to_grid(), points, rng)
+
+    def to_bitboard(self, points: int = 0, rng: RandomSource | None = None) -> Bitboard:
+        """Return a new mutable Bitboard of this board."""
+        return Bitboard(int(self), points, rng)
+
+    @property
+    def values(self) -> list[int]:
+        """The tile values of all cells, in linear index order."""
+        return decode(self)
+
+    def __getitem__(self, idx: GridIndex | int) -> int:
+        """Get the tile value at a grid index (row and column) or a linear index."""
+        if isinstance(idx, GridIndex):
+            idx = self.WIDTH * idx.row + idx.col
+        exponent = (self >> (4 * idx)) & 0xF
+        return 1 << exponent if exponent else 0
+
+    def move(self, move: Moves) -> tuple[Board, int]:
+        """Return the board after a move, before a tile spawns, and the points gained."""
+        board, points = execute_move(self, move)
+        return Board(board), points
+
+    def afterstates(self) -> list[tuple[Moves, Board, int]]:
+        """Return the move, resulting board and points gained of every legal move."""
+        results = []
+        for move in MOVES:
+            board, points = execute_move(self, move)
+            if board != self:
+                results.append((move, Board(board), points))
+        return results
+
+    def spawn(self, idx: int, val: int) -> Board:
+        """Return the board with a tile of value VAL (2 or 4) added to an empty cell."""
+        if val not in (2, 4):
+            raise ValueError(f"Can't spawn a tile of value {val}.")
+        return Board(self | tile_exponent(val) << (4 * idx))
+
+    @property
+    def legal_moves(self) -> list[Moves]:
+        return [move for move in MOVES if execute_move(self, move)[0] != self]
+
+    @property
+    def game_over(self) -> bool:
+        """Returns true iff no move changes the board."""
+        return not has_moves(self)
+
+    @property
+    def empty_cells(self) -> list[int]:
+        """The linear indices of all empty cells."""
+        return empty_indices(self)
+
+    @property
+    def max(self) -> int:
+        """The largest tile value on the board."""
+        exponent = max((self >> (4 * i)) & 0xF for i in range(self.SIZE))
+        return 1 << exponent if exponent else 0
+
+    def canonical(self) -> tuple[Board, Symmetry]:
+        """Return the canonical board among all rotations and reflections of this board,
+        along with the symmetry mapping this board to it."""
+        board, symmetry = canonical_board(self)
+        return Board(board), symmetry
+
+    def __str__(self) -> str:
+        return str(self.to_grid())
+
+    def __repr__(self) -> str:
+        return f"Board({int(self):#018x})"
@@ -1,7 +1,23 @@
 from __future__ import annotations
-from typing import Callable, overload
+from functools import lru_cache
+from typing import Callable, Sequence, overload
 
 from .grid_index import GridIndex
+from .symmetry import Symmetry, canonical
+
+
+@lru_cache(maxsize=None)
+def line_offsets(
+    width: int, height: int, select_rows: bool, axis: int, reverse: bool
+) -> tuple[int, ...]:
+    """Return the linear indices of a row or column of a grid of the given dimensions,
+    in the order of a view of it. The offsets are computed once per distinct line and
+    shared by all views of grids of the same dimensions."""
+    if select_rows:
+        offsets = tuple(axis * width + col for col in range(width))
+    else:
+        offsets = tuple(row * width + axis for row in range(height))
+    return offsets[::-1] if reverse else offsets
 
 
 class Grid:
@@ -9,7 +25,8 @@ class Grid:
     A 2d integer grid, backed by a single list, with support for row and column views.
     The grid can be accessed either by a linearized index or via a GridIndex (row and
     column tuple). The views allow operating on aribitrary rows or columns as though
-    they were a single list.
+    they were a single list. The grid keeps an index of its empty (zero) entries, which
+    is updated on every write, so that empty entries can be counted and sampled in O(1).
     """
 
     DEFAULT_WIDTH: int = 4
@@ -22,10 +39,21 @@ class Grid:
         height: int = DEFAULT_HEIGHT,
     ) -> None:
         if arr is None:
-            arr = [0 for _ in range(self.DEFAULT_WIDTH * self.DEFAULT_HEIGHT)]
+            arr = [0 for _ in range(width * height)]
+        elif len(arr) != width * height:
+            raise ValueError(
+                f"Expected {width * height} entries for a {width}x{height} grid, "
+                f"got {len(arr)}."
+            )
         self._arr = arr
         self._width = width
         self._height = height
+        # The linear indices of all empty entries in arbitrary order, and the position
+        # of every entry in that list (or -1 if the entry is not empty)
+        self._empty: list[int] = [index for index, val in enumerate(arr) if val == 0]
+        self._empty_pos: list[int] = [-1] * len(arr)
+        for pos, index in enumerate(self._empty):
+            self._empty_pos[index] = pos
 
     @overload
     def __getitem__(self, idx: int) -> int:
@@ -60,9 +88,27 @@ class Grid:
         """Set an element of the grid, either by a grid index (row and column)
         or by a linear index that directly accesses the underlying array."""
         if isinstance(idx, GridIndex):
-            self._arr[self.linearized_index(idx)] = val
-        else:
-            self._arr[idx] = val
+            idx = self.linearized_index(idx)
+        arr = self._arr
+        was_empty = arr[idx] == 0
+        arr[idx] = val
+        if was_empty != (val == 0):
+            if was_empty:
+                self._remove_empty(idx)
+            else:
+                self._empty_pos[idx] = len(self._empty)
+                self._empty.append(idx)
+
+    def _remove_empty(self, idx: int) -> None:
+        """Remove a linear index from the index of empty entries, by moving the last
+        empty index into its position."""
+        empty, empty_pos = self._empty, self._empty_pos
+        pos = empty_pos[idx]
+        last = empty.pop()
+        if last != idx:
+            empty[pos] = last
+            empty_pos[last] = pos
+        empty_pos[idx] = -1
 
     def linearized_index(self, idx: GridIndex) -> int:
         """Return a linearized index given a grid index (row and column)."""
@@ -77,6 +123,74 @@ class Grid:
         entries of the grid holds."""
         return [index for index, val in enumerate(self._arr) if condition(val)]
 
+    def copy(self) -> Grid:
+        """Return a copy of this grid, including its index of empty entries."""
+        grid = Grid.__new__(Grid)
+        grid._arr = self._arr[:]
+        grid._width = self._width
+        grid._height = self._height
+        grid._empty = self._empty[:]
+        grid._empty_pos = self._empty_pos[:]
+        return grid
+
+    def to_list(self) -> list[int]:
+        """Return a copy of the underlying list of the grid."""
+        return self._arr[:]
+
+    def canonical_key(self) -> tuple[tuple[int, ...], Symmetry]:
+        """Return a key which is the same for all rotations and reflections of this grid,
+        along with the symmetry mapping this grid to the orientation of the key."""
+        return canonical(self._arr, self._width, self._height)
+
+    def read_line(self, offsets: Sequence[int]) -> list[int]:
+        """Return a list of the entries at the given linear indices."""
+        arr = self._arr
+        return [arr[idx] for idx in offsets]
+
+    def write_line(self, offsets: Sequence[int], values: Sequence[int]) -> None:
+        """Write VALUES to the entries at the given linear indices in one step, only
+        touching entries whose value changes."""
+        arr = self._arr
+        for idx, val in zip(offsets, values):
+            old = arr[idx]
+            if old != val:
+                arr[idx] = val
+                if old == 0:
+                    self._remove_empty(idx)
+                elif val == 0:
+                    self._empty_pos[idx] = len(self._empty)
+                    self._empty.append(idx)
+
+    def has_equal_neighbors(self) -> bool:
+        """Returns true iff two horizontally or vertically adjacent entries are equal,
+        checked in one pass over the rows and one over the columns."""
+        arr, width = self._arr, self._width
+        for start in range(0, len(arr), width):
+            row = arr[start : start + width]
+            for a, b in zip(row, row[1:]):
+                if a == b:
+                    return True
+        for a, b in zip(arr, arr[width:]):
+            if a == b:
+                return True
+        return False
+
+    def random_empty(self, rand: Callable[[], float]) -> int:
+        """Return the linear index of a random empty entry in O(1), given a function
+        RAND returning uniform random floats in [0, 1). The grid must not be full."""
+        empty = self._empty
+        return empty[int(rand() * len(empty))]
+
+    @property
+    def empty_cells(self) -> list[int]:
+        """Return a list of the linear indices of all empty entries, in no particular order."""
+        return list(self._empty)
+
+    @property
+    def empty_count(self) -> int:
+        """Return the number of empty entries in O(1)."""
+        return len(self._empty)
+
     @property
     def width(self) -> int:
         """The width of the grid."""
@@ -133,6 +247,8 @@ class GridView:
     A view of a Grid instance that allows accessing and working with rows or columns
     of the grid similarly to a regular list. Any method that operates on the view will
     mutate the corrsponding entries of the grid instance assosciated with the view.
+    Elements are accessed through a precomputed table of linear offsets into the grid,
+    and whole lines can be moved in one step with read_line and write_line.
     """
 
     def __init__(
@@ -151,6 +267,7 @@ class GridView:
         self._select_rows = select_rows
         self._axis = axis
         self._reverse = reverse
+        self._offsets = line_offsets(grid.width, grid.height, select_rows, axis, reverse)
 
     def get_grid_index(self, index: int) -> GridIndex:
         """Convert an index, which is to be passed to a GridView view, to a GridIndex,
@@ -163,15 +280,31 @@ class GridView:
 
     def __getitem__(self, index: int) -> int:
         """Get an element of the view, which refers to an element of a grid."""
-        return self._grid[self.get_grid_index(index)]
+        return self._grid._arr[self._offsets[index]]
 
     def __setitem__(self, index: int, val) -> None:
         """Set an element of the view, which refers to an element of a grid."""
-        self._grid[self.get_grid_index(index)] = val
+        self._grid[self._offsets[index]] = val
 
     def __len__(self) -> int:
         """The length of my view, equivalent to the length of the row or column I represent."""
-        return self._grid.width if self._select_rows else self._grid.height
+        return len(self._offsets)
+
+    def __iter__(self):
+        return iter(self.read_line())
+
+    def read_line(self) -> list[int]:
+        """Return a list of all elements of the view."""
+        return self._grid.read_line(self._offsets)
+
+    def write_line(self, values: Sequence[int]) -> None:
+        """Overwrite all elements of the view with VALUES in one step."""
+        self._grid.write_line(self._offsets, values)
+
+    @property
+    def offsets(self) -> tuple[int, ...]:
+        """The linear indices of the grid entries referred to by my view, in order."""
+        return self._offsets
 
     def __eq__(self, other: object, /) -> bool:
         """Add equality support for comparing a view to regular lists."""
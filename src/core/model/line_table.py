@@ -0,0 +1,169 @@
+from __future__ import annotations
+import os
+from array import array
+from typing import Sequence
+
+ROW_MASK = 0xFFFF
+NUM_ROWS = 1 << 16
+MAX_EXPONENT = 0xF
+LINE_LENGTH = 4
+MAGIC = b"2048LINE\x01"
+
+# The tile value of every exponent, and the exponent of every tile value which can be
+# looked up in the line tables. Tiles of the largest exponent are left out, since packed
+# rows never merge them while State does, so lines holding them (or any value which is
+# not a power of two) are collapsed by State.collapse_destructive instead.
+VALUES: tuple[int, ...] = (0, *(1 << e for e in range(1, MAX_EXPONENT + 1)))
+EXPONENTS: dict[int, int] = {VALUES[e]: e for e in range(MAX_EXPONENT)}
+
+# Move tables, indexed by a packed 16-bit row of four tile exponents. Built once on first
+# use. The column tables hold the collapsed row already spread out into a column of a
+# packed board.
+_row_left: list[int] | None = None
+_row_right: list[int] | None = None
+_col_up: list[int] | None = None
+_col_down: list[int] | None = None
+_row_points: list[int] | None = None
+
+# Line tables, indexed by the same packed rows: the tile values of the line collapsed to
+# the left and to the right, and whether each collapse changes the line (bit 0 to the
+# left, bit 1 to the right). The points gained are those of the row tables.
+_line_left: list[tuple[int, ...]] | None = None
+_line_right: list[tuple[int, ...]] | None = None
+_line_collapsible: bytearray | None = None
+
+
+def _collapse_row(exponents: list[int]) -> tuple[list[int], int]:
+    """Collapse a row of tile exponents to the left, following the same rules as
+    State.collapse_destructive. Returns the collapsed row and the points gained.
+    Two tiles of the largest representable exponent are not merged, since the
+    result would not fit in a nibble."""
+    tiles = [e for e in exponents if e != 0]
+    result = []
+    points = 0
+    i = 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1] != MAX_EXPONENT:
+            result.append(tiles[i] + 1)
+            points += 1 << (tiles[i] + 1)
+            i += 2
+        else:
+            result.append(tiles[i])
+            i += 1
+    return result + [0] * (len(exponents) - len(result)), points
+
+
+def _build_row_tables() -> tuple[list[int], list[int], list[int]]:
+    """Build the tables mapping every packed row to its collapsed row when moved left
+    and right, and the points gained by the move (identical for both directions)."""
+    left, right = [0] * NUM_ROWS, [0] * NUM_ROWS
+    points = [0] * NUM_ROWS
+    for row in range(NUM_ROWS):
+        exponents = [(row >> (4 * i)) & 0xF for i in range(4)]
+        collapsed, points[row] = _collapse_row(exponents)
+        left[row] = pack_row(collapsed)
+        collapsed, _ = _collapse_row(exponents[::-1])
+        right[row] = pack_row(collapsed[::-1])
+    return left, right, points
+
+
+def _spread(rows: list[int]) -> list[int]:
+    """Spread out every packed row into the first column of a packed board."""
+    return [
+        (row & 0xF) | (row & 0xF0) << 12 | (row & 0xF00) << 24 | (row & 0xF000) << 36
+        for row in rows
+    ]
+
+
+def _load_row_tables(path: str) -> tuple[list[int], list[int], list[int]] | None:
+    """Load the row tables saved by save_row_tables, or return None if the file is
+    missing or holds anything else."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if data[: len(MAGIC)] != MAGIC or len(data) != len(MAGIC) + 8 * NUM_ROWS:
+        return None
+    offset = len(MAGIC)
+    left, right, points = array("H"), array("H"), array("I")
+    left.frombytes(data[offset : offset + 2 * NUM_ROWS])
+    right.frombytes(data[offset + 2 * NUM_ROWS : offset + 4 * NUM_ROWS])
+    points.frombytes(data[offset + 4 * NUM_ROWS :])
+    return left.tolist(), right.tolist(), points.tolist()
+
+
+def save_row_tables(path: str) -> None:
+    """Save the row tables to a file, so that later processes can load them with
+    row_tables(path) instead of building them."""
+    row_tables()
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(array("H", _row_left).tobytes())
+        f.write(array("H", _row_right).tobytes())
+        f.write(array("I", _row_points).tobytes())
+    # Replace the file in one step, so that concurrent readers never see a partial file
+    os.replace(tmp, path)
+
+
+def row_tables(path: str | None = None) -> tuple[list[int], ...]:
+    """Return the (left, right, up, down, points) move tables, building them on first use.
+    If a PATH is given, the tables are loaded from it, or built and saved to it if the
+    file doesn't exist yet."""
+    global _row_left, _row_right, _col_up, _col_down, _row_points
+    if _row_left is None:
+        tables = _load_row_tables(path) if path is not None else None
+        if tables is None:
+            tables = _build_row_tables()
+        _row_left, _row_right, _row_points = tables
+        _col_up, _col_down = _spread(_row_left), _spread(_row_right)
+        if path is not None and not os.path.exists(path):
+            save_row_tables(path)
+    return _row_left, _row_right, _col_up, _col_down, _row_points
+
+
+def line_tables(path: str | None = None) -> tuple[list, list, list[int], bytearray]:
+    """Return the (left, right, points, collapsible) line tables, building them on first
+    use from the row tables, which are cached at PATH if given (see row_tables)."""
+    global _line_left, _line_right, _line_collapsible
+    if _line_left is None:
+        left, right, _, _, _ = row_tables(path)
+        _line_left = [unpack_row(row) for row in left]
+        _line_right = [unpack_row(row) for row in right]
+        _line_collapsible = bytearray(
+            (left[row] != row) | (right[row] != row) << 1 for row in range(NUM_ROWS)
+        )
+    return _line_left, _line_right, _row_points, _line_collapsible
+
+
+def line_key(line: Sequence[int]) -> int | None:
+    """Return the index of a line of tile values into the line tables, or None if the
+    line is not four tiles long or holds a value which can't be looked up (see
+    EXPONENTS)."""
+    if len(line) != LINE_LENGTH:
+        return None
+    try:
+        return (
+            EXPONENTS[line[0]]
+            | EXPONENTS[line[1]] << 4
+            | EXPONENTS[line[2]] << 8
+            | EXPONENTS[line[3]] << 12
+        )
+    except KeyError:
+        return None
+
+
+def pack_row(exponents: list[int]) -> int:
+    """Pack four tile exponents into a 16-bit row, the first exponent in the lowest nibble."""
+    return exponents[0] | exponents[1] << 4 | exponents[2] << 8 | exponents[3] << 12
+
+
+def unpack_row(row: int) -> tuple[int, ...]:
+    """Return the tile values of a packed 16-bit row."""
+    return (
+        VALUES[row & 0xF],
+        VALUES[row >> 4 & 0xF],
+        VALUES[row >> 8 & 0xF],
+        VALUES[row >> 12],
+    )
@@ -0,0 +1,50 @@
+from random import Random
+from typing import Protocol, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class RandomSource(Protocol):
+    """The interface of the random number generators accepted by states and agents.
+    Satisfied by random.Random as well as RandomStream."""
+
+    def random(self) -> float: ...
+
+    def choice(self, seq: Sequence[T]) -> T: ...
+
+
+class RandomStream:
+    """
+    A seeded source of uniform random floats that is drawn from a pre-generated block
+    of numbers, which is refilled from an underlying random.Random once exhausted.
+    Drawing from the stream is a single iterator step, which makes it cheaper than
+    calling into random.Random for every spawn in bulk simulation.
+    """
+
+    BLOCK_SIZE: int = 4096
+
+    def __init__(self, seed: int | None = None, block_size: int = BLOCK_SIZE) -> None:
+        self._rng = Random(seed)
+        self._block_size = block_size
+        self._refill()
+
+    def _refill(self) -> None:
+        """Draw a new block of random numbers."""
+        rand = self._rng.random
+        self._next = iter([rand() for _ in range(self._block_size)]).__next__
+
+    def random(self) -> float:
+        """Return the next random float in [0, 1)."""
+        try:
+            return self._next()
+        except StopIteration:
+            self._refill()
+            return self._next()
+
+    def randrange(self, n: int) -> int:
+        """Return a random integer in [0, n)."""
+        return int(self.random() * n)
+
+    def choice(self, seq: Sequence[T]) -> T:
+        """Return a random element of a non-empty sequence."""
+        return seq[int(self.random() * len(seq))]
@@ -1,7 +1,46 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import NamedTuple
 from .moves import Moves
-from random import choice, choices
-from .grid import Grid, GridView
+from random import Random
+from .grid import Grid, GridView, line_offsets
 from .grid_index import GridIndex
+from .line_table import line_key, line_tables
+from .rng import RandomSource
+from .symmetry import Symmetry
+
+# The orientation of the views of every move, such that each move collapses its views
+# to the left
+VIEW_KWARGS = {
+    Moves.LEFT: {"select_rows": True, "reverse": False},
+    Moves.DOWN: {"select_rows": False, "reverse": True},
+    Moves.UP: {"select_rows": False, "reverse": False},
+    Moves.RIGHT: {"select_rows": True, "reverse": True},
+}
+
+
+@lru_cache(maxsize=None)
+def move_lines(width: int, height: int) -> dict[Moves, tuple[tuple[int, ...], ...]]:
+    """Return the linear offsets of all lines of a grid of the given dimensions, in the
+    order of the views of every move. Computed once per grid size and shared by all
+    states, so that states can be copied without creating any views."""
+    return {
+        move: tuple(
+            line_offsets(width, height, axis=axis, **VIEW_KWARGS[move])
+            for axis in range(height if VIEW_KWARGS[move]["select_rows"] else width)
+        )
+        for move in Moves
+    }
+
+
+class Afterstate(NamedTuple):
+    """The result of a move on a state, before a tile spawns: the resulting state (None
+    if the move is illegal) and the points gained by the move."""
+
+    move: Moves
+    state: State | None
+    points: int
+    legal: bool
 
 
 class State:
@@ -20,8 +59,22 @@ class State:
     PROBABILITY_TWO: float = 0.9
     PROBABILITY_FOUR: float = 0.1
     WIN_THRESHOLD: int = 2048
+    # The bit of each move in a legal move mask and the moves of every possible mask
+    MOVE_BITS: dict[Moves, int] = {move: 1 << i for i, move in enumerate(Moves)}
+    MASK_MOVES: tuple[tuple[Moves, ...], ...] = tuple(
+        tuple(move for i, move in enumerate(Moves) if mask & 1 << i)
+        for mask in range(1 << len(Moves))
+    )
 
-    def __init__(self, grid: Grid | None = None, points: int = 0) -> None:
+    def __init__(
+        self,
+        grid: Grid | None = None,
+        points: int = 0,
+        rng: RandomSource | None = None,
+        keep_history: bool = False,
+        width: int = WIDTH,
+        height: int = HEIGHT,
+    ) -> None:
         """
         Initialize a Board instance, which stores the value of all tiles in a linearized grid.
         By default creates a grid of zeros of dimensions specified in the grid class.
@@ -30,30 +83,36 @@ class State:
             grid: An optional Grid instance which stores the configuration of tiles. By default,
             a grid with only two tiles is created.
             points: The number of accrued points. Defaults to zero.
+            rng: An optional random number generator used to spawn tiles, such as a seeded
+            random.Random or a RandomStream. By default, a new unseeded generator is used.
+            keep_history: Record every move made, so that moves can be undone and redone.
+            width: The width of the grid created if no grid is given.
+            height: The height of the grid created if no grid is given.
         """
+        self._rng = rng if rng is not None else Random()
+        self._last_spawn: tuple[int, int] | None = None
+        self._legal_mask: int | None = None
+        # Entries of (move, prior board, prior points, spawn) of every move made
+        self._history: list[tuple] | None = [] if keep_history else None
+        self._redo: list[tuple] = []
         if grid is None:
-            self._grid: Grid = Grid()
+            self._grid: Grid = Grid(width=width, height=height)
             self.add_tile(num_tiles=2)
         else:
             self._grid: Grid = grid
         self._points = points
         self._won = self._grid.max > self.WIN_THRESHOLD
-        self._views: dict[Moves, list[GridView]] = self.generate_views(self._grid)
+        self._lines = move_lines(self._grid.width, self._grid.height)
+        self._views: dict[Moves, list[GridView]] | None = None
 
     @staticmethod
     def generate_views(grid: Grid) -> dict[Moves, list[GridView]]:
         """Returns a dictionary of all possible views for the given grid, where the keys of the
         keys of the dictionary are the moves corresponding to those views. Note that this should
         probably not be used for larger grid sizes, since the returned views are all stored in
-        memory. This has the advantage that with smaller grid sizes we don't have to create view
-        instances after instantiating a state. For larger grid sizes, consider a lazy loading
-        approach. (Or just, you know, use numpy...)"""
-        kwargs_dict = {
-            Moves.LEFT: {"select_rows": True, "reverse": False},
-            Moves.DOWN: {"select_rows": False, "reverse": True},
-            Moves.UP: {"select_rows": False, "reverse": False},
-            Moves.RIGHT: {"select_rows": True, "reverse": True},
-        }
+        memory. States therefore only generate their views on first use, and operate on the
+        shared line offsets of move_lines otherwise."""
+        kwargs_dict = VIEW_KWARGS
         num_axes_dict = {
             Moves.LEFT: grid.height,
             Moves.DOWN: grid.width,
@@ -72,18 +131,50 @@ class State:
     def views(self, move: Moves) -> list[GridView]:
         """Return a list of views corresponding to a move. For example, if call #views(Moves.DOWN)
         we will get a list of views of all columns, where indexing reverse order."""
+        if self._views is None:
+            self._views = self.generate_views(self._grid)
         return self._views[move]
 
+    def copy(self) -> State:
+        """Return a copy of this state with its own grid, which shares the random number
+        generator and line offsets of this state. The copy starts without any history."""
+        state = self._derive(self._grid.copy(), self._points)
+        state._last_spawn = self._last_spawn
+        state._legal_mask = self._legal_mask
+        return state
+
+    def _derive(self, grid: Grid, points: int) -> State:
+        """Return a state with the given grid and points, which otherwise is a copy of
+        this state without a last spawn or cached legal moves, and with an empty history."""
+        state = State.__new__(State)
+        state._rng = self._rng
+        state._last_spawn = None
+        state._legal_mask = None
+        state._grid = grid
+        state._points = points
+        state._won = self._won
+        state._lines = self._lines
+        state._views = None
+        state._history = [] if self._history is not None else None
+        state._redo = []
+        return state
+
     def add_tile(self, num_tiles=1):
         """Add random tile(s) (either a 2 or a 4), weighted accordingly, to an empty position of the board."""
+        rand = self._rng.random
+        history = self._history
+        # A tile added right after a move made without one is recorded as its spawn
+        after_move = self._last_spawn is None and history and history[-1][3] is None
         for _ in range(num_tiles):
             # Choose a random empty index
-            index = choice(self.grid.where(lambda x: x == 0))
+            index = self._grid.random_empty(rand)
             # Choose whether to place a two or a four
-            val = choices(
-                [2, 4], weights=[self.PROBABILITY_TWO, self.PROBABILITY_FOUR], k=1
-            )[0]
+            val = 2 if rand() < self.PROBABILITY_TWO else 4
             self[index] = val
+            self._last_spawn = (index, val)
+        self._legal_mask = None
+        if after_move:
+            history[-1] = (*history[-1][:3], self._last_spawn)
 
     def __getitem__(self, idx: GridIndex | int):
         """Get an element of my grid, either by a grid index (row and column)
@@ -94,21 +185,127 @@ class State:
         """Set an element of my grid, either by a grid index (row and column)
         or by a linear index that directly accesses the underlying array."""
         self.grid[idx] = val
+        self._legal_mask = None
 
     def make_move(self, move: Moves, add_tile: bool = True):
         """Apply a move to the state, collapsing the grid in the appropriate direction
         and then adding a tile randomly to an empty position if ADD_TILE is true."""
-        if move not in self.legal_moves:
+        if not self.legal_mask & self.MOVE_BITS[move]:
             raise Exception("Attempting to make an illegal move.")
+        if self._history is not None:
+            prior = (self._grid.to_list(), self._points)
+        self._last_spawn = None
         self.collapse(move)
+        if self._history is not None:
+            self._history.append((move, *prior, None))
+            self._redo.clear()
         if add_tile:
             self.add_tile()
 
+    def undo(self) -> Moves:
+        """Undo the last move, restoring the board and points from before the move in place,
+        and return the undone move. Requires the state to keep its history."""
+        if not self._history:
+            raise Exception("No move to undo.")
+        entry = self._history.pop()
+        move, prior, points, _ = entry
+        self._redo.append((move, self._grid.to_list(), self._points, entry[3]))
+        self._grid.write_line(range(self._grid.size), prior)
+        self._points = points
+        self._last_spawn = self._history[-1][3] if self._history else None
+        self._legal_mask = None
+        return move
+
+    def redo(self) -> Moves:
+        """Redo the last undone move, including the tile it spawned, and return the move."""
+        if not self._redo:
+            raise Exception("No move to redo.")
+        move, board, points, spawn = self._redo.pop()
+        self._history.append((move, self._grid.to_list(), self._points, spawn))
+        self._grid.write_line(range(self._grid.size), board)
+        self._points = points
+        self._last_spawn = spawn
+        self._legal_mask = None
+        return move
+
+    def canonical_key(self) -> tuple[tuple[int, ...], Symmetry]:
+        """Return a key which is the same for all rotations and reflections of my grid,
+        along with the symmetry mapping my grid to the orientation of the key. Moves
+        chosen in that orientation map back to moves on this state with
+        Symmetry.to_original."""
+        return self._grid.canonical_key()
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._history)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
     def collapse(self, move: Moves):
         """Collapse the grid in a given direction by applying the collapse algorithm to
-        all rows or columns of the grid in the correct direction."""
-        for view in self.views(move):
-            self._points += self.collapse_destructive(view)
+        all rows or columns of the grid in the correct direction. Lines of four tiles
+        are looked up in the precomputed line tables, all others are collapsed by
+        collapse_destructive."""
+        grid = self._grid
+        left, _, points, collapsible = line_tables()
+        for offsets in self._lines[move]:
+            line = grid.read_line(offsets)
+            key = line_key(line)
+            if key is None:
+                self._points += self.collapse_destructive(line)
+                grid.write_line(offsets, line)
+            elif collapsible[key] & 1:
+                self._points += points[key]
+                grid.write_line(offsets, left[key])
+        self._legal_mask = None
+
+    def afterstates(self) -> list[Afterstate]:
+        """Return the afterstate of every move, in the order of Moves, in a single pass
+        over the grid: every row is read once for the left and right moves and every
+        column once for the up and down moves, and each line is collapsed in both
+        directions by one lookup in the line tables. Illegal moves have no state. The
+        legal moves found along the way are cached, as by legal_mask."""
+        grid = self._grid
+        size = grid.size
+        left, right, line_points, collapsible = line_tables()
+        results = {}
+        mask = 0
+        for move, opposite in ((Moves.LEFT, Moves.RIGHT), (Moves.UP, Moves.DOWN)):
+            forward, backward = [0] * size, [0] * size
+            forward_points = backward_points = 0
+            flags = 0
+            for offsets in self._lines[move]:
+                line = grid.read_line(offsets)
+                key = line_key(line)
+                if key is None:
+                    ahead, behind = line[:], line[::-1]
+                    forward_points += self.collapse_destructive(ahead)
+                    backward_points += self.collapse_destructive(behind)
+                    behind.reverse()
+                    flags |= (ahead != line) | (behind != line) << 1
+                else:
+                    ahead, behind = left[key], right[key]
+                    forward_points += line_points[key]
+                    backward_points += line_points[key]
+                    flags |= collapsible[key]
+                for idx, ahead_val, behind_val in zip(offsets, ahead, behind):
+                    forward[idx] = ahead_val
+                    backward[idx] = behind_val
+            for m, values, points, legal in (
+                (move, forward, forward_points, flags & 1),
+                (opposite, backward, backward_points, flags & 2),
+            ):
+                if legal:
+                    mask |= self.MOVE_BITS[m]
+                    grid_after = Grid(values, grid.width, grid.height)
+                    after = self._derive(grid_after, self._points + points)
+                    results[m] = Afterstate(m, after, points, True)
+                else:
+                    results[m] = Afterstate(m, None, 0, False)
+        self._legal_mask = mask
+        return [results[move] for move in Moves]
 
     @staticmethod
     def is_list_collapsible(lst: list[int] | GridView) -> bool:
@@ -130,22 +327,70 @@ class State:
 
     def collapsible_by_move(self, move: Moves):
         """Returns true iff the grid is collapsible in a given move direction."""
-        for view in self.views(move):
-            if self.is_list_collapsible(view):
+        grid = self._grid
+        collapsible = line_tables()[3]
+        for offsets in self._lines[move]:
+            line = grid.read_line(offsets)
+            key = line_key(line)
+            if key is None:
+                if self.is_list_collapsible(line):
+                    return True
+            elif collapsible[key] & 1:
                 return True
         return False
 
     def collapsible(self):
         """Returns true iff the grid is collapsible in any move direction."""
-        for move in Moves:
-            if self.collapsible_by_move(move):
-                return True
-        return False
+        return self.legal_mask != 0
+
+    @property
+    def legal_mask(self) -> int:
+        """Return a bitmask of all legal moves given the current game state, in which
+        the bit of each move is given by MOVE_BITS. The mask is computed once per
+        change of the board and cached until the next call to __setitem__, collapse
+        or add_tile. Note that writing to the grid directly bypasses the cache."""
+        if self._legal_mask is None:
+            self._legal_mask = self._compute_legal_mask()
+        return self._legal_mask
+
+    def _compute_legal_mask(self) -> int:
+        # The line tables tell whether a line is collapsible in both directions, so only
+        # the rows of the left move and the columns of the up move are read
+        grid = self._grid
+        collapsible = line_tables()[3]
+        bits = self.MOVE_BITS
+        mask = 0
+        for move, opposite in ((Moves.LEFT, Moves.RIGHT), (Moves.UP, Moves.DOWN)):
+            flags = 0
+            for offsets in self._lines[move]:
+                line = grid.read_line(offsets)
+                key = line_key(line)
+                if key is None:
+                    flags |= self.is_list_collapsible(line)
+                    flags |= self.is_list_collapsible(line[::-1]) << 1
+                else:
+                    flags |= collapsible[key]
+                if flags == 3:
+                    break
+            if flags & 1:
+                mask |= bits[move]
+            if flags & 2:
+                mask |= bits[opposite]
+        return mask
+
+    def is_legal(self, move: Moves) -> bool:
+        """Returns true iff a move is legal given the current game state."""
+        return bool(self.legal_mask & self.MOVE_BITS[move])
 
     @property
     def legal_moves(self):
         """Return a list of all legal moves given the current game state."""
-        return [move for move in Moves if self.collapsible_by_move(move)]
+        return list(self.MASK_MOVES[self.legal_mask])
+
+    @property
+    def empty_count(self) -> int:
+        """The number of empty tiles of my grid."""
+        return self._grid.empty_count
 
     @property
     def width(self):
@@ -205,8 +450,31 @@ class State:
     @property
     def game_over(self):
         """Returns true iff the game is over, which is the case when no
-        more legal moves are available."""
-        return len(self.legal_moves) == 0
+        more legal moves are available. The legal moves are never computed here: a
+        grid with both tiles and empty cells always has a legal move, and a full grid
+        has one iff two adjacent tiles are equal."""
+        # Every move spawns a tile and so clears the cached legal mask, which is only
+        # still set if something asked for the legal moves since. No flag needs to
+        # outlive a spawn, since the empty count already answers almost every check
+        # in O(1)
+        if self._legal_mask is not None:
+            return self._legal_mask == 0
+        grid = self._grid
+        empty = grid.empty_count
+        if empty:
+            return empty == grid.size
+        return not grid.has_equal_neighbors()
+
+    @property
+    def last_spawn(self) -> tuple[int, int] | None:
+        """The (linear) index and value of the most recently added tile, or None if the
+        last move was made without adding a tile."""
+        return self._last_spawn
+
+    @property
+    def rng(self) -> RandomSource:
+        """The random number generator used to spawn tiles."""
+        return self._rng
 
     @property
     def points(self):
@@ -0,0 +1,103 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import NamedTuple, Sequence
+
+from .moves import Moves
+
+# The direction of every move as a (row, column) step
+DIRECTIONS: dict[Moves, tuple[int, int]] = {
+    Moves.LEFT: (0, -1),
+    Moves.DOWN: (1, 0),
+    Moves.UP: (-1, 0),
+    Moves.RIGHT: (0, 1),
+}
+MOVES_BY_DIRECTION: dict[tuple[int, int], Moves] = {
+    direction: move for move, direction in DIRECTIONS.items()
+}
+
+
+class Symmetry(NamedTuple):
+    """
+    One of the 8 rotations and reflections of a grid, given as a transposition followed
+    by flipping the order of the rows and/or the columns. A symmetry maps a board in its
+    original orientation to a transformed (for example canonical) orientation.
+    """
+
+    transpose: bool
+    flip_rows: bool
+    flip_cols: bool
+
+    def to_transformed(self, move: Moves) -> Moves:
+        """Map a move on the original board to the equivalent move on the transformed board."""
+        row, col = DIRECTIONS[move]
+        if self.transpose:
+            row, col = col, row
+        if self.flip_rows:
+            row = -row
+        if self.flip_cols:
+            col = -col
+        return MOVES_BY_DIRECTION[(row, col)]
+
+    def to_original(self, move: Moves) -> Moves:
+        """Map a move on the transformed board back to the equivalent move on the original board."""
+        row, col = DIRECTIONS[move]
+        if self.flip_rows:
+            row = -row
+        if self.flip_cols:
+            col = -col
+        if self.transpose:
+            row, col = col, row
+        return MOVES_BY_DIRECTION[(row, col)]
+
+    def permutation(self, width: int, height: int) -> tuple[int, ...]:
+        """Return the linear index in the original grid of every linear index in the
+        transformed grid, for an original grid of the given dimensions."""
+        return _permutation(self, width, height)
+
+
+IDENTITY = Symmetry(False, False, False)
+SYMMETRIES: tuple[Symmetry, ...] = tuple(
+    Symmetry(transpose, flip_rows, flip_cols)
+    for transpose in (False, True)
+    for flip_rows in (False, True)
+    for flip_cols in (False, True)
+)
+
+
+@lru_cache(maxsize=None)
+def _permutation(symmetry: Symmetry, width: int, height: int) -> tuple[int, ...]:
+    if symmetry.transpose:
+        width_t, height_t = height, width
+    else:
+        width_t, height_t = width, height
+    permutation = []
+    for row in range(height_t):
+        for col in range(width_t):
+            r = height_t - 1 - row if symmetry.flip_rows else row
+            c = width_t - 1 - col if symmetry.flip_cols else col
+            if symmetry.transpose:
+                r, c = c, r
+            permutation.append(r * width + c)
+    return tuple(permutation)
+
+
+def symmetries(width: int, height: int) -> tuple[Symmetry, ...]:
+    """Return all symmetries of a grid of the given dimensions. Only square grids can be
+    transposed onto themselves, so non-square grids have 4 symmetries instead of 8."""
+    if width == height:
+        return SYMMETRIES
+    return tuple(symmetry for symmetry in SYMMETRIES if not symmetry.transpose)
+
+
+def canonical(
+    values: Sequence[int], width: int, height: int
+) -> tuple[tuple[int, ...], Symmetry]:
+    """Return the canonical key of a grid given as a list of values, which is the same
+    for all rotations and reflections of the grid, along with the symmetry mapping the
+    grid to its canonical orientation."""
+    best_key, best_symmetry = tuple(values), IDENTITY
+    for symmetry in symmetries(width, height)[1:]:
+        key = tuple([values[i] for i in symmetry.permutation(width, height)])
+        if key < best_key:
+            best_key, best_symmetry = key, symmetry
+    return best_key, best_symmetry
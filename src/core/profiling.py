@@ -0,0 +1,172 @@
+from __future__ import annotations
+import json
+
+from .model import Moves, State
+
+# The phases of a move timed by a profiler: choosing the move, checking and applying
+# it, spawning a tile and checking whether the game is over. The game over check runs
+# once more than the other phases, after the last move
+PHASES = ("get_move", "make_move", "add_tile", "game_over")
+# Durations are counted in buckets of powers of two microseconds, where bucket 0 holds
+# durations below 1us and bucket i durations in [2^(i-1), 2^i) us
+NUM_BUCKETS = 32
+
+
+def bucket(seconds: float) -> int:
+    """Return the histogram bucket of a duration."""
+    return min(int(seconds * 1e6).bit_length(), NUM_BUCKETS - 1)
+
+
+class PhaseStats:
+    """The number, total, minimum and maximum duration of the calls to one phase, along
+    with a histogram of their durations."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.histogram = [0] * NUM_BUCKETS
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.histogram[bucket(seconds)] += 1
+
+    def merge(self, other: PhaseStats) -> None:
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "histogram": self.histogram,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> PhaseStats:
+        stats = cls()
+        stats.count = data["count"]
+        stats.total = data["total"]
+        stats.min = data["min"] if stats.count else float("inf")
+        stats.max = data["max"]
+        stats.histogram = list(data["histogram"])
+        return stats
+
+
+class Profiler:
+    """
+    Opt-in instrumentation of games. A game given a profiler times every phase of every
+    move (see PHASES and Game.play) and counts the moves made in every direction. A profiler can be
+    shared by many games, or the profiles of separate games (for example played in
+    worker processes) can be exported as plain dictionaries and merged.
+    """
+
+    def __init__(self) -> None:
+        self._phases = {phase: PhaseStats() for phase in PHASES}
+        self._moves = {move: 0 for move in Moves}
+        self._games = 0
+        self._points = 0
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Record the duration of one call to a phase."""
+        self._phases[phase].record(seconds)
+
+    def record_move(self, move: Moves) -> None:
+        self._moves[move] += 1
+
+    def record_game(self, state: State) -> None:
+        """Record the end of a game in a state."""
+        self._games += 1
+        self._points += state.points
+
+    def merge(self, other: Profiler | dict) -> Profiler:
+        """Add the records of another profiler, or of one exported with to_dict, to mine
+        and return myself."""
+        if isinstance(other, dict):
+            other = Profiler.from_dict(other)
+        for phase, stats in other._phases.items():
+            self._phases[phase].merge(stats)
+        for move, count in other._moves.items():
+            self._moves[move] += count
+        self._games += other._games
+        self._points += other._points
+        return self
+
+    @property
+    def games(self) -> int:
+        return self._games
+
+    @property
+    def num_moves(self) -> int:
+        return sum(self._moves.values())
+
+    def phase(self, phase: str) -> PhaseStats:
+        return self._phases[phase]
+
+    def to_dict(self) -> dict:
+        """Return a structured summary of all records, which can be serialized as JSON."""
+        total = sum(stats.total for stats in self._phases.values())
+        return {
+            "games": self._games,
+            "moves": self.num_moves,
+            "points": self._points,
+            "moves_by_direction": {move.name: n for move, n in self._moves.items()},
+            "phases": {
+                phase: {
+                    **stats.to_dict(),
+                    "share": stats.total / total if total else 0.0,
+                }
+                for phase, stats in self._phases.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Profiler:
+        profiler = cls()
+        profiler._games = data["games"]
+        profiler._points = data["points"]
+        for name, count in data["moves_by_direction"].items():
+            profiler._moves[Moves[name]] = count
+        for phase, stats in data["phases"].items():
+            profiler._phases[phase] = PhaseStats.from_dict(stats)
+        return profiler
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> Profiler:
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def __str__(self) -> str:
+        lines = [
+            f"{self._games} games, {self.num_moves} moves",
+            f"{'phase':<12}{'calls':>10}{'total (s)':>12}{'mean (us)':>12}"
+            f"{'max (us)':>12}{'share':>8}",
+        ]
+        summary = self.to_dict()["phases"]
+        for phase, stats in summary.items():
+            lines.append(
+                f"{phase:<12}{stats['count']:>10}{stats['total']:>12.3f}"
+                f"{stats['mean'] * 1e6:>12.1f}{stats['max'] * 1e6:>12.1f}"
+                f"{stats['share']:>8.1%}"
+            )
+        return "\n".join(lines)
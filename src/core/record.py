@@ -0,0 +1,206 @@
+import mmap
+import struct
+from array import array
+from typing import BinaryIO, Iterator
+
+from .agent import Agent
+from .game import AgentGame
+from .model import Moves, State
+from .model.bitboard import Bitboard, execute_move
+from .model.rng import RandomSource
+from .profiling import Profiler
+
+# A file of records starts with MAGIC, followed by the records of all games. Each game
+# is stored as a header (initial packed board, initial points, number of moves) and
+# one byte per move. The two lowest bits of a move byte hold the index of the move in
+# Moves, the next four bits the linear index of the spawned tile, bit six is set if
+# the spawned tile is a four and bit seven is set if no tile was spawned at all.
+MAGIC = b"2048REC\x01"
+HEADER = struct.Struct("<QII")
+MOVES = list(Moves)
+MOVE_CODES = {move: code for code, move in enumerate(MOVES)}
+FOUR = 0x40
+NO_SPAWN = 0x80
+
+
+def encode_move(move: Moves, spawn: tuple[int, int] | None) -> int:
+    """Encode a move and the (index, value) of the tile spawned after it in one byte."""
+    code = MOVE_CODES[move]
+    if spawn is None:
+        return code | NO_SPAWN
+    index, val = spawn
+    return code | index << 2 | (FOUR if val == 4 else 0)
+
+
+def decode_move(code: int) -> tuple[Moves, tuple[int, int] | None]:
+    """Decode a move byte into the move and the (index, value) of the spawned tile."""
+    move = MOVES[code & 0x3]
+    if code & NO_SPAWN:
+        return move, None
+    return move, ((code >> 2) & 0xF, 4 if code & FOUR else 2)
+
+
+class GameWriter:
+    """
+    Writes games to a binary file of records, one game at a time. A game is started
+    with begin, every move is added with record and the game is written with end.
+    Only 4x4 games with tiles up to 2^15 can be recorded.
+    """
+
+    def __init__(self, path: str, append: bool = False) -> None:
+        self._file: BinaryIO = open(path, "ab" if append else "wb")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._header: tuple[int, int] | None = None
+        self._moves = bytearray()
+
+    def begin(self, state: State) -> None:
+        """Start recording a game from a given initial state."""
+        board = Bitboard.from_state(state).board
+        self._header = (board, state.points)
+        self._moves.clear()
+
+    def record(self, move: Moves, state: State) -> None:
+        """Record a move, given the state right after the move and its tile spawn."""
+        self._moves.append(encode_move(move, state.last_spawn))
+
+    def end(self) -> None:
+        """Write the game recorded since the last call to begin to the file."""
+        if self._header is None:
+            raise Exception("Attempting to end a game that was never started.")
+        board, points = self._header
+        self._file.write(HEADER.pack(board, points, len(self._moves)))
+        self._file.write(self._moves)
+        self._header = None
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "GameWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class GameRecord:
+    """A single recorded game, given by its initial board and points and its move bytes."""
+
+    def __init__(self, board: int, points: int, moves: bytes) -> None:
+        self._board = board
+        self._points = points
+        self._moves = moves
+
+    def __len__(self) -> int:
+        """The number of moves of the game."""
+        return len(self._moves)
+
+    def __iter__(self) -> Iterator[tuple[Moves, tuple[int, int] | None]]:
+        """Iterate over all moves and the (index, value) of the tile spawned after them."""
+        for code in self._moves:
+            yield decode_move(code)
+
+    def bitboard_at(self, num_moves: int | None = None) -> Bitboard:
+        """Return the bitboard after the first NUM_MOVES moves (all moves by default)."""
+        board, points = self._board, self._points
+        for code in self._moves[:num_moves]:
+            board, gained = execute_move(board, MOVES[code & 0x3])
+            points += gained
+            if not code & NO_SPAWN:
+                board |= (2 if code & FOUR else 1) << (4 * ((code >> 2) & 0xF))
+        return Bitboard(board, points)
+
+    def state_at(self, num_moves: int | None = None) -> State:
+        """Return the state after the first NUM_MOVES moves (all moves by default)."""
+        return self.bitboard_at(num_moves).to_state()
+
+    @property
+    def initial_state(self) -> State:
+        return self.state_at(0)
+
+    @property
+    def final_state(self) -> State:
+        return self.state_at()
+
+
+class GameReader:
+    """
+    Reads a binary file of recorded games by memory-mapping it, so that files of
+    millions of games can be iterated over or randomly accessed without loading them.
+    The offsets of all games are indexed on the first random access.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a file of recorded games.")
+        self._offsets: array | None = None
+
+    def _record_at(self, offset: int) -> tuple[GameRecord, int]:
+        """Return the game starting at OFFSET and the offset of the next game."""
+        board, points, num_moves = HEADER.unpack_from(self._mmap, offset)
+        start = offset + HEADER.size
+        end = start + num_moves
+        return GameRecord(board, points, self._mmap[start:end]), end
+
+    @property
+    def offsets(self) -> array:
+        """The offsets of all games in the file."""
+        if self._offsets is None:
+            self._offsets = array("Q")
+            offset = len(MAGIC)
+            while offset < len(self._mmap):
+                self._offsets.append(offset)
+                num_moves = HEADER.unpack_from(self._mmap, offset)[2]
+                offset += HEADER.size + num_moves
+        return self._offsets
+
+    def __len__(self) -> int:
+        """The number of games in the file."""
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> GameRecord:
+        return self._record_at(self.offsets[index])[0]
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        """Iterate over all games in the order they were written, without indexing."""
+        offset = len(MAGIC)
+        while offset < len(self._mmap):
+            record, offset = self._record_at(offset)
+            yield record
+
+    def close(self) -> None:
+        """Close the file."""
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "GameReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class RecordingGame(AgentGame):
+    """A game played by an agent which records itself to a GameWriter."""
+
+    def __init__(
+        self,
+        agent: Agent,
+        writer: GameWriter,
+        state: State | None = None,
+        rng: RandomSource | None = None,
+        profiler: Profiler | None = None,
+    ) -> None:
+        super().__init__(agent, state, rng, profiler)
+        self._writer = writer
+
+    def do_before_game(self) -> None:
+        self._writer.begin(self.state)
+
+    def do_after_every_move(self) -> None:
+        self._writer.record(self.last_move, self.state)
+
+    def do_on_game_over(self) -> None:
+        self._writer.end()
@@ -0,0 +1,288 @@
+from __future__ import annotations
+import json
+import math
+from bisect import bisect_left, bisect_right
+from typing import Sequence
+
+from .game import Game
+
+# Max tiles whose reach rates are reported by default
+REACH_TILES = tuple(1 << e for e in range(7, 18))
+
+
+class RunningStats:
+    """The count, mean, variance, minimum and maximum of a stream of numbers, computed
+    online with Welford's algorithm in constant memory. Partial statistics of separate
+    streams merge exactly."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def merge(self, other: RunningStats) -> RunningStats:
+        """Add the statistics of another stream to mine and return myself."""
+        if other.count:
+            count = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / count
+            self.m2 += other.m2 + delta * delta * self.count * other.count / count
+            self.count = count
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """The sample variance, or 0 for fewer than two numbers."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "std": self.std,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> RunningStats:
+        stats = cls()
+        stats.count, stats.mean, stats.m2 = data["count"], data["mean"], data["m2"]
+        if stats.count:
+            stats.min, stats.max = data["min"], data["max"]
+        return stats
+
+
+class Histogram:
+    """Counts of numbers in fixed buckets given by sorted edges: bucket 0 holds numbers
+    below the first edge, bucket i numbers in [edges[i-1], edges[i]) and the last bucket
+    numbers from the last edge on."""
+
+    def __init__(self, edges: Sequence[float], counts: list[int] | None = None) -> None:
+        self.edges = list(edges)
+        self.counts = counts if counts is not None else [0] * (len(self.edges) + 1)
+
+    def add(self, x: float, count: int = 1) -> None:
+        self.counts[bisect_right(self.edges, x)] += count
+
+    def merge(self, other: Histogram) -> Histogram:
+        if other.edges != self.edges:
+            raise ValueError("Can't merge histograms with different buckets.")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        return self
+
+    def at_least(self, x: float) -> int:
+        """The number of numbers counted in the buckets starting at or above X."""
+        return sum(self.counts[bisect_left(self.edges, x) + 1 :])
+
+    def to_dict(self) -> dict:
+        return {"edges": self.edges, "counts": self.counts}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Histogram:
+        return cls(data["edges"], list(data["counts"]))
+
+
+class QuantileSketch:
+    """
+    Approximate quantiles of a stream of non-negative numbers in bounded memory. Positive
+    numbers are counted in logarithmic buckets, such that every quantile is returned with
+    a relative error of at most ACCURACY (as in DDSketch). The number of buckets grows
+    only with the logarithm of the range of the numbers, and sketches with the same
+    accuracy merge exactly.
+    """
+
+    def __init__(self, accuracy: float = 0.01) -> None:
+        self.accuracy = accuracy
+        self._gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        if x <= 0:
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(x) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: QuantileSketch) -> QuantileSketch:
+        if other.accuracy != self.accuracy:
+            raise ValueError("Can't merge sketches of different accuracy.")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Return the approximate Q-quantile, for Q in [0, 1], or NaN if empty."""
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return 2 * self._gamma**index / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "accuracy": self.accuracy,
+            "zeros": self.zeros,
+            "count": self.count,
+            "buckets": {str(index): count for index, count in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> QuantileSketch:
+        sketch = cls(data["accuracy"])
+        sketch.zeros, sketch.count = data["zeros"], data["count"]
+        sketch.buckets = {int(index): n for index, n in data["buckets"].items()}
+        return sketch
+
+
+class GameStats:
+    """
+    Aggregates the results of many games one at a time in constant memory: the mean,
+    variance and quantiles of the scores and game lengths, the rate at which every max
+    tile was reached, and the quantiles of the time per move. Aggregates of separate
+    workers are exported with to_dict and merged.
+    """
+
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self, accuracy: float = 0.01) -> None:
+        self.scores = RunningStats()
+        self.score_quantiles = QuantileSketch(accuracy)
+        self.moves = RunningStats()
+        self.move_quantiles = QuantileSketch(accuracy)
+        self.max_tiles = Histogram([1 << e for e in range(1, 18)])
+        self.latencies = QuantileSketch(accuracy)
+
+    def add(self, score: int, max_tile: int, moves: int) -> None:
+        """Add the result of one game."""
+        self.scores.add(score)
+        self.score_quantiles.add(score)
+        self.moves.add(moves)
+        self.move_quantiles.add(moves)
+        self.max_tiles.add(max_tile)
+
+    def add_game(self, game: Game) -> None:
+        """Add the result of a finished game."""
+        self.add(game.state.points, game.state.grid.max, game.num_moves)
+
+    def add_latency(self, seconds: float) -> None:
+        """Add the time taken by one move."""
+        self.latencies.add(seconds)
+
+    def merge(self, other: GameStats | dict) -> GameStats:
+        """Add another aggregate, or one exported with to_dict, to mine and return myself."""
+        if isinstance(other, dict):
+            other = GameStats.from_dict(other)
+        self.scores.merge(other.scores)
+        self.score_quantiles.merge(other.score_quantiles)
+        self.moves.merge(other.moves)
+        self.move_quantiles.merge(other.move_quantiles)
+        self.max_tiles.merge(other.max_tiles)
+        self.latencies.merge(other.latencies)
+        return self
+
+    @property
+    def games(self) -> int:
+        return self.scores.count
+
+    def reach_rate(self, tile: int) -> float:
+        """The fraction of games whose max tile was at least TILE."""
+        return self.max_tiles.at_least(tile) / self.games if self.games else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "scores": self.scores.to_dict(),
+            "score_quantiles": self.score_quantiles.to_dict(),
+            "moves": self.moves.to_dict(),
+            "move_quantiles": self.move_quantiles.to_dict(),
+            "max_tiles": self.max_tiles.to_dict(),
+            "latencies": self.latencies.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> GameStats:
+        stats = cls()
+        stats.scores = RunningStats.from_dict(data["scores"])
+        stats.score_quantiles = QuantileSketch.from_dict(data["score_quantiles"])
+        stats.moves = RunningStats.from_dict(data["moves"])
+        stats.move_quantiles = QuantileSketch.from_dict(data["move_quantiles"])
+        stats.max_tiles = Histogram.from_dict(data["max_tiles"])
+        stats.latencies = QuantileSketch.from_dict(data["latencies"])
+        return stats
+
+    def summary(self) -> dict:
+        """Return the headline numbers of the aggregate, for reports."""
+
+        def quantiles(sketch: QuantileSketch) -> dict:
+            return {f"p{round(q * 100)}": sketch.quantile(q) for q in self.QUANTILES}
+
+        return {
+            "games": self.games,
+            "score": {
+                "mean": self.scores.mean,
+                "std": self.scores.std,
+                **quantiles(self.score_quantiles),
+            },
+            "moves": {"mean": self.moves.mean, **quantiles(self.move_quantiles)},
+            "reach": {str(tile): self.reach_rate(tile) for tile in REACH_TILES},
+            "seconds_per_move": quantiles(self.latencies),
+        }
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump({"summary": self.summary(), **self.to_dict()}, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> GameStats:
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def __str__(self) -> str:
+        summary = self.summary()
+        score, moves = summary["score"], summary["moves"]
+        latency = summary["seconds_per_move"]
+        reach = ", ".join(
+            f"{tile}: {rate:.1%}" for tile, rate in summary["reach"].items() if rate
+        )
+        return "\n".join(
+            [
+                f"Score: mean {score['mean']:.1f} (std {score['std']:.1f}), "
+                f"p50 {score['p50']:.0f}, p90 {score['p90']:.0f}, p99 {score['p99']:.0f}",
+                f"Moves: mean {moves['mean']:.1f}, p50 {moves['p50']:.0f}, "
+                f"p90 {moves['p90']:.0f}, p99 {moves['p99']:.0f}",
+                f"Max tile reached: {reach or 'none'}",
+                f"Time per move: p50 {latency['p50'] * 1e6:.1f}us, "
+                f"p90 {latency['p90'] * 1e6:.1f}us, p99 {latency['p99'] * 1e6:.1f}us",
+            ]
+        )
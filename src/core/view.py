@@ -1,11 +1,12 @@
 from abc import abstractmethod
 
-from .model import State
+from .event_loop import StateChannel
 from .subject import Subject
 
 
 class View(Subject):
     @abstractmethod
-    def display(self, state: State) -> None:
-        """Take a state and display it in some form."""
+    def display(self, channel: StateChannel) -> None:
+        """Display the state shared by a channel in some form, sampling it at the view's
+        own rate, until the game is closed or the user quits."""
         pass
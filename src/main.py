@@ -1,23 +1,27 @@
 import argparse
 
-from agents import RandomAgent
+from agents import load_agent
 from core import State, Controller
-from views import CLIView, PygameView
+from views import VIEWS, load_view
+
+# Agents which search on packed 4x4 bitboards
+BITBOARD_AGENTS = ("expectimax", "montecarlo", "ntuple", "evolution")
 
 parser = argparse.ArgumentParser(description="Parse script arguments.")
 parser.add_argument(
     "--view",
     type=str,
     default="cli",
-    choices=["cli", "pygame", "flask"],
+    choices=list(VIEWS),
     help="What mode to run the game in (default: CLI)",
 )
 parser.add_argument(
     "--agent",
     type=str,
     default="random",
-    choices=["none", "random"],
-    help="What agent should the game use (default: none)",
+    choices=["none", "random", "expectimax", "montecarlo", "ntuple", "evolution"],
+    help="What agent should the game use (default: random). The evolution agent is "
+    "the n-tuple agent, whose network is learned in self-play.",
 )
 parser.add_argument(
     "--width", type=int, default=4, help="The width of the grid to be played on."
@@ -25,27 +29,36 @@ parser.add_argument(
 parser.add_argument(
     "--height", type=int, default=4, help="The height of the grid to be played on."
 )
+parser.add_argument(
+    "--weights",
+    type=str,
+    default="ntuple.weights",
+    help="The saved network of the ntuple (evolution) agent.",
+)
 parser.add_argument("--verbose", action="store_true", help="Enable verbose output.")
 args = parser.parse_args()
+if args.width < 2 or args.height < 2:
+    parser.error("The grid must be at least 2x2.")
+if args.agent in BITBOARD_AGENTS and (args.width, args.height) != (4, 4):
+    parser.error(f"The {args.agent} agent only plays on 4x4 grids.")
 
 
 def main():
-    state = State()
-    match args.view:
-        case "cli":
-            view = CLIView()
-        case "pygame":
-            view = PygameView()
-        case _:
-            raise ValueError("View not available.")
+    state = State(width=args.width, height=args.height)
+    # Only the selected view and agent are imported
+    view = load_view(args.view)()
 
     match args.agent:
-        case "random":
-            agent = RandomAgent()
-        case "evolution":
-            raise NotImplementedError()
+        case "none":
+            agent = None
+        case "ntuple" | "evolution":
+            agent = load_agent("ntuple")(args.weights)
+        case "montecarlo":
+            # The agent plays on a thread of the controller, and forking a process pool
+            # from a multithreaded process isn't safe, so rollouts run on that thread
+            agent = load_agent(args.agent)(workers=1)
         case _:
-            raise ValueError("Agent not available.")
+            agent = load_agent(args.agent)()
     controller = Controller(state, view, agent)
     controller.play()
 
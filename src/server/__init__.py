@@ -0,0 +1,3 @@
+from .games import GameStore
+from .service import GameServer
+from .client import GameClient
@@ -0,0 +1,25 @@
+import argparse
+
+from .service import GameServer
+
+parser = argparse.ArgumentParser(
+    description="Host many games of 2048 in memory behind a local JSON API."
+)
+parser.add_argument(
+    "--host", type=str, default="127.0.0.1", help="The address to listen on."
+)
+parser.add_argument("--port", type=int, default=2048, help="The port to listen on.")
+
+
+def main():
+    args = parser.parse_args()
+    with GameServer((args.host, args.port)) as server:
+        print(f"Serving games on http://{args.host}:{server.server_port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
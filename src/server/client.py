@@ -0,0 +1,54 @@
+import json
+from http.client import HTTPConnection
+
+
+class GameClient:
+    """
+    A client of a GameServer, which sends all its requests over one persistent
+    connection. Failed requests raise a RuntimeError with the error of the server.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 2048) -> None:
+        self._connection = HTTPConnection(host, port)
+
+    def request(self, method: str, path: str, body: dict | None = None) -> dict:
+        data = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+        self._connection.request(method, path, data, headers)
+        response = self._connection.getresponse()
+        result = json.loads(response.read())
+        if response.status >= 400:
+            raise RuntimeError(result["error"])
+        return result
+
+    def create(
+        self,
+        num_games: int = 1,
+        width: int = 4,
+        height: int = 4,
+        seed: int | None = None,
+    ) -> list[dict]:
+        body = {"count": num_games, "width": width, "height": height, "seed": seed}
+        return self.request("POST", "/games", body)["games"]
+
+    def get(self, game_id: str) -> dict:
+        return self.request("GET", f"/games/{game_id}")
+
+    def delete(self, game_id: str) -> None:
+        self.request("DELETE", f"/games/{game_id}")
+
+    def make_moves(self, moves: dict[str, str]) -> dict[str, dict]:
+        """Make one move in each of many games, given by ID, in a single request."""
+        return self.request("POST", "/moves", {"moves": moves})["results"]
+
+    def metrics(self) -> dict:
+        return self.request("GET", "/metrics")
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "GameClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
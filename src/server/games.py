@@ -0,0 +1,102 @@
+from itertools import count
+from threading import Lock
+
+from core.model import Moves, RandomStream, State
+
+
+def parse_move(name: str) -> Moves:
+    """Return the move with a name such as "left" or "LEFT"."""
+    try:
+        return Moves[name.upper()]
+    except (KeyError, AttributeError):
+        raise ValueError(f"Unknown move {name!r}.")
+
+
+def describe(game_id: str, state: State) -> dict:
+    """Return the JSON representation of a game."""
+    return {
+        "id": game_id,
+        "grid": state.grid.to_list(),
+        "width": state.width,
+        "height": state.height,
+        "points": state.points,
+        "legal_moves": [move.name for move in state.legal_moves],
+        "game_over": state.game_over,
+        "won": state.won,
+    }
+
+
+class GameStore:
+    """
+    Many games held in memory by ID. All operations are thread-safe, so that one store
+    can serve the requests of many connections at once.
+    """
+
+    # The most games created by a single request
+    MAX_CREATE = 1000
+
+    def __init__(self) -> None:
+        self._games: dict[str, State] = {}
+        self._ids = count()
+        self._lock = Lock()
+
+    def create(
+        self,
+        num_games: int = 1,
+        width: int = State.WIDTH,
+        height: int = State.HEIGHT,
+        seed: int | None = None,
+    ) -> list[dict]:
+        """Start between 1 and MAX_CREATE new games and return them. If a SEED is given,
+        game i of the batch spawns its tiles from a random stream seeded with SEED + i."""
+        if not 1 <= num_games <= self.MAX_CREATE:
+            raise ValueError(f"Can only create 1 to {self.MAX_CREATE} games at once.")
+        if width < 2 or height < 2:
+            raise ValueError("The grid must be at least 2x2.")
+        created = []
+        for i in range(num_games):
+            rng = RandomStream(seed + i) if seed is not None else None
+            state = State(rng=rng, width=width, height=height)
+            with self._lock:
+                game_id = str(next(self._ids))
+                self._games[game_id] = state
+            created.append(describe(game_id, state))
+        return created
+
+    def get(self, game_id: str) -> dict:
+        with self._lock:
+            return describe(game_id, self._state(game_id))
+
+    def delete(self, game_id: str) -> None:
+        with self._lock:
+            self._state(game_id)
+            del self._games[game_id]
+
+    def make_moves(self, moves: dict[str, str]) -> dict[str, dict]:
+        """Make one move in each of many games, given as a mapping of game IDs to move
+        names, and return the resulting games by ID. A move fails without affecting the
+        other moves of the batch, in which case its result holds an error instead. An
+        illegal move leaves its game unchanged, which the result reports as not moved."""
+        results = {}
+        with self._lock:
+            for game_id, name in moves.items():
+                try:
+                    state = self._state(game_id)
+                    move = parse_move(name)
+                except (KeyError, ValueError) as e:
+                    results[game_id] = {"id": game_id, "error": str(e.args[0])}
+                    continue
+                moved = state.is_legal(move)
+                if moved:
+                    state.make_move(move)
+                results[game_id] = {**describe(game_id, state), "moved": moved}
+        return results
+
+    def _state(self, game_id: str) -> State:
+        try:
+            return self._games[game_id]
+        except KeyError:
+            raise KeyError(f"Unknown game {game_id!r}.")
+
+    def __len__(self) -> int:
+        return len(self._games)
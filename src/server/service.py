@@ -0,0 +1,134 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock
+from time import perf_counter
+
+from core.profiling import PhaseStats
+
+from .games import GameStore
+
+
+class GameServer(ThreadingHTTPServer):
+    """
+    A local HTTP server hosting many games of a GameStore behind a JSON API:
+
+        POST   /games        {"count": n, "width": w, "height": h, "seed": s}
+        GET    /games/<id>
+        DELETE /games/<id>
+        POST   /moves        {"moves": {"<id>": "left", ...}}
+        GET    /metrics
+
+    Every connection is served on its own thread and kept alive between requests, so
+    clients send all their requests over one connection. The latency of every request
+    is recorded per route and reported by /metrics.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], store: GameStore | None = None):
+        super().__init__(address, GameRequestHandler)
+        self.store = store if store is not None else GameStore()
+        self._latencies: dict[str, PhaseStats] = {}
+        self._num_moves = 0
+        self._metrics_lock = Lock()
+
+    def record(self, route: str, seconds: float, num_moves: int = 0) -> None:
+        """Record the latency of a request to a route."""
+        with self._metrics_lock:
+            stats = self._latencies.get(route)
+            if stats is None:
+                stats = self._latencies[route] = PhaseStats()
+            stats.record(seconds)
+            self._num_moves += num_moves
+
+    def metrics(self) -> dict:
+        with self._metrics_lock:
+            return {
+                "games": len(self.store),
+                "moves": self._num_moves,
+                "latency": {
+                    route: stats.to_dict() for route, stats in self._latencies.items()
+                },
+            }
+
+
+class GameRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive unless the client closes them. The headers and
+    # body of a response are written separately, so Nagle's algorithm would hold back
+    # the body until the client acknowledges the headers.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: GameServer
+
+    def do_GET(self) -> None:
+        self.handle_request("GET")
+
+    def do_POST(self) -> None:
+        self.handle_request("POST")
+
+    def do_DELETE(self) -> None:
+        self.handle_request("DELETE")
+
+    def handle_request(self, method: str) -> None:
+        start = perf_counter()
+        parts = self.path.strip("/").split("/")
+        route = f"{method} /{parts[0]}"
+        num_moves = 0
+        try:
+            body = self.read_body()
+            match method, parts:
+                case "POST", ["games"]:
+                    games = self.server.store.create(
+                        body.get("count", 1),
+                        body.get("width", 4),
+                        body.get("height", 4),
+                        body.get("seed"),
+                    )
+                    status, response = 201, {"games": games}
+                case "GET", ["games", game_id]:
+                    status, response = 200, self.server.store.get(game_id)
+                case "DELETE", ["games", game_id]:
+                    self.server.store.delete(game_id)
+                    status, response = 200, {"id": game_id}
+                case "POST", ["moves"]:
+                    moves = body.get("moves")
+                    if not isinstance(moves, dict):
+                        raise ValueError("Expected moves by game ID.")
+                    results = self.server.store.make_moves(moves)
+                    num_moves = sum(
+                        result.get("moved", False) for result in results.values()
+                    )
+                    status, response = 200, {"results": results}
+                case "GET", ["metrics"]:
+                    status, response = 200, self.server.metrics()
+                case _:
+                    # Unknown paths share one key, so that they can't grow the metrics
+                    route = "unknown"
+                    status, response = 404, {"error": f"Unknown route {self.path}."}
+        except KeyError as e:
+            status, response = 404, {"error": str(e.args[0])}
+        except (ValueError, TypeError) as e:
+            status, response = 400, {"error": str(e)}
+        self.send_json(status, response)
+        self.server.record(route, perf_counter() - start, num_moves)
+
+    def read_body(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        if not length:
+            return {}
+        body = json.loads(self.rfile.read(length))
+        if not isinstance(body, dict):
+            raise ValueError("Expected a JSON object.")
+        return body
+
+    def send_json(self, status: int, response: dict) -> None:
+        data = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args) -> None:
+        # Logging every request to stderr would dominate the cost of small requests
+        pass
@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+from multiprocessing import Pool
+from time import perf_counter
+
+from agents import AGENTS, load_agent
+from core import AgentGame, Profiler
+from core.agent import Agent
+from core.model import RandomStream
+from core.model.line_table import line_tables
+from core.model.rng import RandomSource
+from core.stats import GameStats
+
+parser = argparse.ArgumentParser(
+    description="Play many games of an agent headlessly and record the results."
+)
+parser.add_argument(
+    "--agent",
+    type=str,
+    default="random",
+    choices=list(AGENTS),
+    help="What agent should play the games (default: random)",
+)
+parser.add_argument(
+    "--games", type=int, default=100, help="The number of games to play."
+)
+parser.add_argument(
+    "--workers",
+    type=int,
+    default=os.cpu_count(),
+    help="The number of worker processes (default: one per core).",
+)
+parser.add_argument(
+    "--seed",
+    type=int,
+    default=0,
+    help="The base seed. Game i is played with seed SEED + i.",
+)
+parser.add_argument(
+    "--weights",
+    type=str,
+    default="ntuple.weights",
+    help="The saved network of the ntuple agent.",
+)
+parser.add_argument(
+    "--output",
+    type=str,
+    default="results.jsonl",
+    help="The file to stream per-game results to, one JSON object per line.",
+)
+parser.add_argument(
+    "--line-table",
+    type=str,
+    default=None,
+    help="Cache the precomputed line tables in this file, so workers load them.",
+)
+parser.add_argument(
+    "--stats",
+    type=str,
+    default=None,
+    help="Save the aggregate statistics of all games as JSON to this file.",
+)
+parser.add_argument(
+    "--profile",
+    type=str,
+    default=None,
+    help="Time every phase of every move and save the merged profile to this file.",
+)
+
+
+def make_agent(
+    name: str, rng: RandomSource | None = None, weights: str | None = None
+) -> Agent:
+    """Return a new agent given its name. WEIGHTS is the saved network of the ntuple
+    agent, which is memory-mapped, so all workers share its pages."""
+    agent = load_agent(name)
+    match name:
+        case "expectimax":
+            return agent()
+        case "montecarlo":
+            # Games already run in parallel, so rollouts run in the game's process
+            return agent(num_rollouts=20, workers=1, rng=rng)
+        case "ntuple":
+            return agent(weights, rng=rng)
+        case _:
+            return agent(rng)
+
+
+class TimedGame(AgentGame):
+    """A game played by an agent which adds the time taken by every move to STATS."""
+
+    def __init__(
+        self,
+        agent: Agent,
+        stats: GameStats,
+        rng: RandomSource | None = None,
+        profiler: Profiler | None = None,
+    ) -> None:
+        super().__init__(agent, rng=rng, profiler=profiler)
+        self._stats = stats
+        self._move_start = 0.0
+
+    def do_before_every_move(self) -> None:
+        self._move_start = perf_counter()
+
+    def do_after_every_move(self) -> None:
+        self._stats.add_latency(perf_counter() - self._move_start)
+
+
+def play_game(
+    agent_name: str,
+    game_index: int,
+    seed: int,
+    weights: str | None = None,
+    profile: bool = False,
+) -> dict:
+    """Play a single game to completion with a fresh agent and a deterministic seed,
+    and return a summary of the result. The state and the agent draw from separate
+    random streams derived from the seed. The statistics of the game are included
+    under the key "stats", and if PROFILE is true, its profile under "profile"."""
+    start = perf_counter()
+    agent = make_agent(agent_name, RandomStream(seed * 2 + 1), weights)
+    profiler = Profiler() if profile else None
+    stats = GameStats()
+    game = TimedGame(agent, stats, rng=RandomStream(seed * 2), profiler=profiler)
+    game.play()
+    stats.add_game(game)
+    result = {
+        "game": game_index,
+        "seed": seed,
+        "score": game.state.points,
+        "max_tile": game.state.grid.max,
+        "moves": game.num_moves,
+        "time": perf_counter() - start,
+        "stats": stats.to_dict(),
+    }
+    if profiler is not None:
+        result["profile"] = profiler.to_dict()
+    return result
+
+
+def _play_game(args: tuple) -> dict:
+    """Unpack the arguments of play_game for use with a process pool."""
+    return play_game(*args)
+
+
+def run(
+    agent_name: str,
+    num_games: int,
+    workers: int,
+    seed: int,
+    output: str,
+    weights: str | None = None,
+    profile: str | None = None,
+    line_table: str | None = None,
+    stats_path: str | None = None,
+) -> None:
+    """Play NUM_GAMES games across a pool of WORKERS processes, streaming the result of
+    every game to OUTPUT as soon as it finishes, and print the aggregate throughput and
+    statistics, which are also saved to STATS_PATH if given. If PROFILE is given, the
+    profiles of all games are merged and saved to it. The line tables are built (or
+    loaded from LINE_TABLE) before the pool starts, so that forked workers share them."""
+    tasks = [
+        (agent_name, i, seed + i, weights, profile is not None)
+        for i in range(num_games)
+    ]
+    profiler = Profiler()
+    stats = GameStats()
+    start = perf_counter()
+    line_tables(line_table)
+    with Pool(workers, line_tables, (line_table,)) as pool, open(output, "w") as f:
+        for result in pool.imap_unordered(_play_game, tasks):
+            stats.merge(result.pop("stats"))
+            if "profile" in result:
+                profiler.merge(result.pop("profile"))
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+    elapsed = perf_counter() - start
+    print(f"Played {num_games} games in {elapsed:.2f}s with {workers} workers.")
+    print(
+        f"Throughput: {num_games / elapsed:.2f} games/s, "
+        f"{stats.moves.mean * stats.games / elapsed:.0f} moves/s"
+    )
+    if num_games:
+        print(stats)
+    if stats_path is not None:
+        stats.save(stats_path)
+    if profile is not None:
+        profiler.save(profile)
+        print(profiler)
+
+
+def main():
+    args = parser.parse_args()
+    run(
+        args.agent,
+        args.games,
+        args.workers,
+        args.seed,
+        args.output,
+        args.weights,
+        args.profile,
+        args.line_table,
+        args.stats,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,32 @@
-from .cli_view import CLIView
-from .pygame_view import PygameView
+from importlib import import_module
+
+# Every view by its name on the command line, as "module:class". Views are imported
+# only when they are used, so that headless runs never load pygame.
+VIEWS: dict[str, str] = {
+    "cli": "cli_view:CLIView",
+    "pygame": "pygame_view:PygameView",
+}
+__all__ = [path.split(":")[1] for path in VIEWS.values()]
+
+
+def _load(path: str) -> type:
+    module, name = path.split(":")
+    return getattr(import_module(f".{module}", __name__), name)
+
+
+def load_view(name: str) -> type:
+    """Import and return the class of the view with the given name."""
+    if name not in VIEWS:
+        raise ValueError("View not available.")
+    return _load(VIEWS[name])
+
+
+def __getattr__(name: str) -> type:
+    for path in VIEWS.values():
+        if path.split(":")[1] == name:
+            return _load(path)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -1,24 +1,70 @@
 import os
-
+import sys
+from select import select
+from time import sleep
 
 from core import State, View
-from core.event import KeyPressEvent
+from core.event import KeyPressEvent, QuitEvent
+from core.event_loop import StateChannel
+
+# Clears the terminal and moves the cursor to its top left corner
+CLEAR = "\x1b[2J\x1b[H"
 
 
 class CLIView(View):
-    def display(self, state: State) -> None:
-        clear()
-        while not state.game_over:
-            print("Welcome to 2048.py!")
-            print(add_padding(str(state), left=5, above=2, below=2))
-            user_input = input("Enter a move (hjkl): ")
-            self.notify(KeyPressEvent(user_input))
-            clear()
+    def __init__(self, fps: int = 10) -> None:
+        """Initialize a terminal view which redraws the state at most FPS times per second."""
+        super().__init__()
+        self._fps = fps
+        # The file descriptor input is read from, or None once input ended, and the
+        # bytes read since the last complete line
+        self._fd: int | None = None
+        self._pending = b""
 
+    def display(self, channel: StateChannel) -> None:
+        # Redraw the state whenever it changed, for example through moves of an agent,
+        # and wait for input between frames. Stdin is polled rather than read on a
+        # thread, so that no read is left blocking when the game ends
+        self._fd = sys.stdin.fileno()
+        self._pending = b""
+        drawn = None
+        while True:
+            closed = channel.closed
+            state = channel.sample()
+            if state is not drawn:
+                self.render(state)
+                drawn = state
+            if closed:
+                break
+            if self._fd is None:
+                sleep(1 / self._fps)
+            else:
+                self.read_input(1 / self._fps)
+        print()
 
-def clear() -> None:
-    """Runs the clear screen command for the current os."""
-    os.system("clear" if os.name == "posix" else "cls")
+    def render(self, state: State) -> None:
+        sys.stdout.write(CLEAR + "Welcome to 2048.py!\n")
+        sys.stdout.write(add_padding(str(state), left=5, above=2, below=2))
+        sys.stdout.write("Enter a move (hjkl, q to quit): ")
+        sys.stdout.flush()
+
+    def read_input(self, timeout: float) -> None:
+        """Wait up to TIMEOUT seconds for input and handle every complete line read.
+        Stops reading at the end of input or once the user quits."""
+        if not select([self._fd], [], [], timeout)[0]:
+            return
+        data = os.read(self._fd, 1024)
+        if not data:
+            self._fd = None
+            return
+        *lines, self._pending = (self._pending + data).split(b"\n")
+        for line in lines:
+            user_input = line.decode(errors="replace")
+            if user_input.strip().lower() == "q":
+                self.notify(QuitEvent())
+                self._fd = None
+                return
+            self.notify(KeyPressEvent(user_input))
 
 
 def add_padding(msg: str, left: int, above: int, below: int):
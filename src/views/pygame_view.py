@@ -1,19 +1,35 @@
 import pygame
 
-from core import State, View, GridIndex
+from core import State, View
+from core.event_loop import StateChannel
 from core.event import KeyPressEvent
 
+LINE_WIDTH = 5
+
 
 class PygameView(View):
-    def __init__(self, width: int = 720, height: int = 720) -> None:
+    def __init__(self, width: int = 720, height: int = 720, fps: int = 30) -> None:
+        """
+        Initialize a pygame window.
+
+        Args:
+            width: The width of the window in pixels.
+            height: The height of the window in pixels.
+            fps: The maximum number of frames drawn per second.
+        """
         super().__init__()
         pygame.init()
         self._width = width
         self._height = height
         self._size = self._width, self._height
+        self._fps = fps
         self._running = True
         self._screen = pygame.display.set_mode(self._size)
         self._font = pygame.font.SysFont("Times New Roman", 65, bold=True)
+        self._clock = pygame.time.Clock()
+        # The rendered text of every tile value, and the tile values drawn last
+        self._glyphs: dict[int, pygame.Surface] = {}
+        self._drawn: list[int] | None = None
 
     @property
     def width(self):
@@ -23,48 +39,77 @@ class PygameView(View):
     def height(self):
         return self._height
 
-    def display(self, state: State) -> None:
+    @property
+    def fps(self):
+        return self._fps
+
+    def display(self, channel: StateChannel) -> None:
         while self._running:
-            self.render(state)
+            self.render(channel.sample())
             for event in pygame.event.get():
-                if event.type == pygame.quit:
+                if event.type == pygame.QUIT:
                     self._running = False
                 if event.type == pygame.KEYDOWN:
                     self.notify(KeyPressEvent(event.unicode))
+            # Sleep for the rest of the frame instead of spinning
+            self._clock.tick(self._fps)
+        pygame.quit()
 
     def render(self, state: State):
-        self._screen.fill("white")
-        self.render_grid(state)
-        self.render_entries(state)
-        pygame.display.flip()
+        """Draw the tiles of the state that changed since the last frame. Nothing is
+        drawn if the state didn't change."""
+        values = state.grid.to_list()
+        if self._drawn is None or len(self._drawn) != len(values):
+            self._screen.fill("white")
+            self.render_grid(state)
+            self._drawn = [0] * len(values)
+            dirty = [self._screen.get_rect()]
+        elif values == self._drawn:
+            return
+        else:
+            dirty = []
+        for index, (val, drawn) in enumerate(zip(values, self._drawn)):
+            if val != drawn:
+                dirty.append(self.render_entry(state, index, val))
+        self._drawn = values
+        pygame.display.update(dirty)
 
     def render_grid(self, state: State):
         for row in range(state.height):
             start = (0, row * self.height / state.height)
             end = (self.width, row * self.height / state.height)
-            pygame.draw.line(self._screen, "black", start, end, width=5)
+            pygame.draw.line(self._screen, "black", start, end, width=LINE_WIDTH)
 
         for col in range(state.width):
             start = (col * self.width / state.width, 0)
             end = (col * self.width / state.width, self.height)
-            pygame.draw.line(self._screen, "black", start, end, width=5)
-
-    def render_entries(self, state: State):
-        dx, dy = self.width // state.width, self.height // state.height
-        lattice_points = [
-            [(x, y) for x in range(0, self.width, dx)]
-            for y in range(0, self.height, dy)
-        ]
-        for row in range(state.width):
-            for col in range(state.height):
-                coordinates = lattice_points[row][col]
-                x, y = coordinates
-                x += dx // 2
-                y += dy // 2
-                val = state[GridIndex(row, col)]
-                if val != 0:
-                    text_surface = self._font.render(str(val), True, "black")
-                    self._screen.blit(text_surface, (x, y))
+            pygame.draw.line(self._screen, "black", start, end, width=LINE_WIDTH)
+
+    def tile_rect(self, state: State, index: int) -> pygame.Rect:
+        """Return the area inside the grid lines of the tile at a linear index."""
+        row, col = divmod(index, state.width)
+        left = round(col * self.width / state.width) + LINE_WIDTH
+        top = round(row * self.height / state.height) + LINE_WIDTH
+        right = round((col + 1) * self.width / state.width) - LINE_WIDTH
+        bottom = round((row + 1) * self.height / state.height) - LINE_WIDTH
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def glyph(self, val: int) -> pygame.Surface:
+        """Return the rendered text of a tile value, rendering it on first use."""
+        surface = self._glyphs.get(val)
+        if surface is None:
+            surface = self._font.render(str(val), True, "black")
+            self._glyphs[val] = surface
+        return surface
+
+    def render_entry(self, state: State, index: int, val: int) -> pygame.Rect:
+        """Redraw the tile at a linear index and return the area drawn."""
+        rect = self.tile_rect(state, index)
+        self._screen.fill("white", rect)
+        if val != 0:
+            surface = self.glyph(val)
+            self._screen.blit(surface, surface.get_rect(center=rect.center))
+        return rect
 
 
 class Block:
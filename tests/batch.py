@@ -0,0 +1,70 @@
+from copy import deepcopy
+
+import numpy as np
+
+from core.model import Moves, State
+from core.model.batch import BatchState, collapse_lines
+from core.model.grid import Grid
+
+collapsable_lists = [
+    [2, 2, 2, 2],
+    [2, 4, 8, 16],
+    [2, 2, 0, 0],
+    [0, 0, 2, 2],
+    [2, 4, 4, 2],
+    [2, 4, 4, 4],
+    [2, 0, 0, 2],
+    [0, 0, 0, 0],
+    [2, 2, 0, 4],
+]
+
+
+def test_collapse_lines():
+    lines, points = collapse_lines(np.array(collapsable_lists))
+    for lst, line, line_points in zip(collapsable_lists, lines, points):
+        expected = deepcopy(lst)
+        expected_points = State.collapse_destructive(expected)
+        assert line.tolist() == expected, f"Failed with input {lst}."
+        assert line_points == expected_points, f"Failed with input {lst}."
+
+
+def test_step():
+    grid = Grid([2, 0, 0, 0, 0, 8, 0, 0, 0, 0, 4, 0, 0, 0, 0, 16])
+    full = Grid([2 if (i // 4 + i % 4) % 2 else 4 for i in range(16)])
+    batch = BatchState.from_states([State(grid), State(grid), State(full)])
+    boards, points, legal, done = batch.step(
+        [Moves.UP, Moves.DOWN, Moves.LEFT], add_tile=False
+    )
+    assert boards[0].ravel().tolist() == [2, 8, 4, 16] + [0] * 12
+    assert boards[1].ravel().tolist() == [0] * 12 + [2, 8, 4, 16]
+    assert boards[2].ravel().tolist() == full
+    assert points.tolist() == [0, 0, 0]
+    assert legal[0].tolist() == [False, True, False, False]
+    assert done.tolist() == [False, False, True]
+    # The returned boards are a snapshot, which the next step doesn't overwrite
+    snapshot = boards.copy()
+    second, _, _, _ = batch.step([Moves.DOWN, Moves.UP, Moves.LEFT])
+    assert second is not boards
+    assert (boards == snapshot).all()
+
+
+def test_add_tile():
+    batch = BatchState(100, rng=np.random.default_rng(0))
+    assert ((batch.boards > 0).sum(axis=(1, 2)) == 2).all()
+    assert np.isin(batch.boards, [0, 2, 4]).all()
+
+
+def test_step_non_square():
+    states = [State(width=5, height=3) for _ in range(8)]
+    for state in states:
+        for _ in range(5):
+            if state.legal_moves:
+                state.make_move(state.legal_moves[0])
+    batch = BatchState.from_states(states)
+    moves = [list(Moves)[i % 4] for i in range(len(states))]
+    boards, points, _, _ = batch.step(moves, add_tile=False)
+    for state, move, board, gained in zip(states, moves, boards, points):
+        before = state.points
+        state.collapse(move)
+        assert board.ravel().tolist() == state.grid
+        assert gained == state.points - before
@@ -0,0 +1,125 @@
+from copy import deepcopy
+from random import Random
+
+import pytest
+
+from core.model import Bitboard, Board, Moves, State
+from core.model.bitboard import (
+    decode,
+    encode,
+    execute_move,
+    has_moves,
+    transpose,
+)
+from core.model.grid import Grid
+
+collapsable_lists = [
+    [2, 2, 2, 2],
+    [2, 4, 8, 16],
+    [2, 2, 0, 0],
+    [0, 0, 2, 2],
+    [2, 4, 4, 2],
+    [2, 4, 4, 4],
+    [2, 0, 0, 2],
+    [0, 0, 0, 0],
+    [2, 2, 0, 4],
+]
+
+
+def test_encode_decode():
+    values = [0] + [2**i for i in range(1, 16)]
+    assert decode(encode(values)) == values
+
+
+def test_encode_rejects_unpackable_tiles():
+    for val in (1, 3, 2**16, -2):
+        with pytest.raises(ValueError):
+            encode([val] + [0] * 15)
+    # Two 32768 tiles merge into a tile the bitboard can't hold
+    state = State(Grid([2**15, 2**15] + [0] * 14))
+    state.collapse(Moves.LEFT)
+    with pytest.raises(ValueError):
+        Bitboard.from_state(state)
+
+
+def test_setitem_rejects_unpackable_tiles():
+    bitboard = Bitboard(0)
+    for val in (1, 3, 2**16):
+        with pytest.raises(ValueError):
+            bitboard[0] = val
+    assert bitboard.board == 0
+    bitboard[0] = 2**15
+    bitboard[0] = 0
+    assert bitboard.board == 0
+    with pytest.raises(ValueError):
+        Board(0).spawn(0, 8)
+    assert Board(0).spawn(0, 4)[0] == 4
+
+
+def test_transpose():
+    values = [2**i for i in range(1, 17)]
+    values[-1] = 0
+    transposed = decode(transpose(encode(values)))
+    for row in range(4):
+        for col in range(4):
+            assert transposed[4 * col + row] == values[4 * row + col]
+
+
+def test_collapse_rows_match_state():
+    for lst in collapsable_lists:
+        expected = deepcopy(lst)
+        expected_points = State.collapse_destructive(expected)
+        board, points = execute_move(encode(lst + [0] * 12), Moves.LEFT)
+        assert decode(board)[:4] == expected, f"Failed with input {lst}."
+        assert points == expected_points, f"Failed with input {lst}."
+
+
+def test_collapse_up():
+    grid = Grid([2, 0, 0, 0, 0, 8, 0, 0, 0, 0, 4, 0, 0, 0, 0, 16])
+    expected = [2, 8, 4, 16, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+    bitboard = Bitboard.from_state(State(grid))
+    bitboard.make_move(Moves.UP, add_tile=False)
+    assert bitboard.grid == expected
+
+
+def test_matches_state():
+    rng = Random(0)
+    for _ in range(20):
+        state = State()
+        while not state.game_over:
+            bitboard = Bitboard.from_state(state)
+            assert bitboard.legal_moves == state.legal_moves
+            move = rng.choice(state.legal_moves)
+            state.collapse(move)
+            bitboard.collapse(move)
+            assert bitboard.grid == state.grid
+            assert bitboard.points == state.points
+            state.add_tile()
+        assert Bitboard.from_state(state).game_over
+
+
+def test_game_over():
+    assert not Bitboard(encode([2 for _ in range(16)])).game_over
+    assert not Bitboard(encode([2 * (i % 2 + 1) for i in range(16)])).game_over
+    checkerboard = [2 if (i // 4 + i % 4) % 2 else 4 for i in range(16)]
+    assert Bitboard(encode(checkerboard)).game_over
+
+
+def test_has_moves():
+    rng = Random(5)
+    checkerboard = [2 if (i // 4 + i % 4) % 2 else 4 for i in range(16)]
+    # Adjacent tiles of 2^15 can't merge on a bitboard
+    stuck = encode([2**15, 2**15] + checkerboard[2:])
+    assert not has_moves(stuck)
+    assert Bitboard(stuck).game_over and not Bitboard(stuck).legal_moves
+    assert has_moves(encode([2**14, 2**14] + checkerboard[2:]))
+    boards = [0, encode([2] + [0] * 15), stuck]
+    for _ in range(2000):
+        # Exponents up to 15, including pairs of tiles that can't merge
+        values = [
+            2 ** rng.randint(12, 15) if rng.random() < 0.97 else 0 for _ in range(16)
+        ]
+        boards.append(encode(values))
+    for board in boards:
+        expected = any(execute_move(board, move)[0] != board for move in Moves)
+        assert has_moves(board) == expected
@@ -0,0 +1,75 @@
+import sys
+from random import Random
+
+import pytest
+
+from core.model import Board, GridIndex, State
+from core.model.grid import Grid
+
+values = [2, 2, 4, 8, 0, 4, 0, 4, 16, 0, 0, 2, 0, 0, 0, 2]
+
+
+def test_conversions():
+    board = Board.from_values(values)
+    assert board.values == values
+    assert board.to_grid().to_list() == values
+    assert Board.from_grid(Grid(values)) == board
+    state = board.to_state(points=12)
+    assert state.points == 12
+    assert Board.from_state(state) == board
+    assert Board.from_bitboard(board.to_bitboard()) == board
+    assert board[1] == 2
+    assert board[GridIndex(2, 0)] == 16
+    assert board.max == 16
+    assert board.empty_cells == [i for i, val in enumerate(values) if not val]
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        Board.from_values([3] + [0] * 15)
+    with pytest.raises(ValueError):
+        Board.from_values([0] * 9)
+    with pytest.raises(ValueError):
+        Board.from_grid(Grid([0] * 9, 3, 3))
+
+
+def test_value_semantics():
+    board = Board.from_values(values)
+    assert board == Board.from_values(list(values))
+    assert len({board, Board.from_values(values), Board(0)}) == 2
+    assert {board: 1}[Board(int(board))] == 1
+    with pytest.raises(AttributeError):
+        board.x = 1
+    # A board has no instance dictionary, so it takes about as much memory as an int
+    assert not hasattr(board, "__dict__")
+    assert sys.getsizeof(board) <= 64
+
+
+def test_moves_match_state():
+    rng = Random(3)
+    state = State(rng=rng)
+    board = Board.from_state(state)
+    while not state.game_over:
+        assert board.legal_moves == state.legal_moves
+        assert not board.game_over
+        expected = {}
+        for move in state.legal_moves:
+            after = state.copy()
+            after.collapse(move)
+            expected[move] = (Board.from_state(after), after.points - state.points)
+        assert {move: (b, p) for move, b, p in board.afterstates()} == expected
+        move = state.legal_moves[rng.randrange(len(state.legal_moves))]
+        moved, points = board.move(move)
+        assert isinstance(moved, Board)
+        state.make_move(move)
+        board = Board.from_state(state)
+        assert (moved, points) == expected[move]
+    assert board.game_over
+    assert board.afterstates() == []
+
+
+def test_spawn():
+    board = Board(0).spawn(5, 4)
+    assert board[5] == 4
+    assert board.spawn(0, 2).values[:6] == [2, 0, 0, 0, 0, 4]
+    assert isinstance(board.canonical()[0], Board)
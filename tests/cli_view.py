@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+
+import views
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(views.__file__)), "main.py")
+
+
+def run_main(*args: str, stdin: str = "", close_stdin: bool = True) -> int:
+    """Run main.py with piped input and return its exit status."""
+    process = subprocess.Popen(
+        [sys.executable, MAIN, *args],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    process.stdin.write(stdin.encode())
+    process.stdin.flush()
+    if close_stdin:
+        process.stdin.close()
+    try:
+        return process.wait(timeout=60)
+    finally:
+        if not close_stdin:
+            process.stdin.close()
+        process.stderr.close()
+
+
+def test_quit_from_piped_input():
+    assert run_main("--agent", "none", stdin="l\nh\nq\n") == 0
+
+
+def test_agent_finishes_with_input_open():
+    # The game ends while stdin is still open, so no read may be left blocking at exit
+    assert run_main("--agent", "random", close_stdin=False) == 0
@@ -0,0 +1,18 @@
+import pytest
+
+from core.model import RandomStream, State
+
+
+@pytest.fixture
+def seeded_state():
+    """Return a function creating the state a few random moves into a seeded game."""
+
+    def make(seed: int = 0, num_moves: int = 20) -> State:
+        rng = RandomStream(seed)
+        state = State(rng=rng)
+        for _ in range(num_moves):
+            moves = state.legal_moves
+            state.make_move(moves[int(rng.random() * len(moves))])
+        return state
+
+    return make
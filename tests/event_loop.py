@@ -0,0 +1,87 @@
+from time import sleep
+
+from agents import RandomAgent
+from core import Controller, State, View
+from core.event import KeyPressEvent, QuitEvent
+from core.event_loop import EventQueue, StateChannel
+from core.model import Moves, RandomStream
+from core.model.grid import Grid
+
+
+class SamplingView(View):
+    """A view which sends some events and then samples the channel until it closes."""
+
+    def __init__(self, events=()) -> None:
+        super().__init__()
+        self.events = events
+        self.samples = []
+
+    def display(self, channel: StateChannel) -> None:
+        for event in self.events:
+            self.notify(event)
+        while not channel.closed:
+            self.samples.append(channel.sample())
+            sleep(0.001)
+        self.samples.append(channel.sample())
+
+
+def test_event_queue_coalesces():
+    queue = EventQueue()
+    for key in "hhhjh":
+        queue.put(KeyPressEvent(key))
+    queue.put(QuitEvent())
+    queue.put(QuitEvent())
+    keys = []
+    while len(queue):
+        event = queue.get()
+        keys.append(event.key if isinstance(event, KeyPressEvent) else "quit")
+    # Repeated keys are separate moves, but repeated requests to quit are redundant
+    assert keys == ["h", "h", "h", "j", "h", "quit"]
+    queue.close()
+    assert queue.get() is None
+
+
+def test_state_channel_samples():
+    state = State(Grid([2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]))
+    channel = StateChannel(state)
+    first = channel.sample()
+    assert channel.sample() is first
+    assert not channel.make_move(Moves.LEFT)
+    assert channel.sample() is first
+    assert channel.make_move(Moves.RIGHT)
+    assert channel.version == 1
+    second = channel.sample()
+    assert second is not first
+    assert second.grid == state.grid
+
+
+def test_agent_plays_to_the_end():
+    state = State(rng=RandomStream(1))
+    view = SamplingView()
+    Controller(state, view, RandomAgent(RandomStream(2))).play()
+    assert state.game_over
+    assert view.samples[-1].grid == state.grid
+
+
+class ClosingAgent(RandomAgent):
+    closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_agent_is_closed():
+    agent = ClosingAgent(RandomStream(2))
+    Controller(State(rng=RandomStream(1)), SamplingView(), agent).play()
+    assert agent.closed
+
+
+def test_key_presses():
+    state = State(Grid([2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]))
+    # Quitting closes the channel, which ends the display of the view
+    keys = [KeyPressEvent(key) for key in "ljx"]
+    view = SamplingView(events=[*keys, QuitEvent()])
+    controller = Controller(state, view)
+    controller.play()
+    assert controller.channel.version == 2
+    assert state.grid[15] != 0
@@ -0,0 +1,39 @@
+from time import perf_counter
+
+from agents import ExpectimaxAgent
+from core.model import State
+from core.model.grid import Grid
+
+
+def test_legal_move(seeded_state):
+    agent = ExpectimaxAgent(depth=2)
+    state = seeded_state()
+    assert agent.get_move(state) in state.legal_moves
+    state = State(Grid([2, 4, 2, 4, 4, 2, 4, 2, 2, 4, 2, 4, 4, 2, 4, 0]))
+    assert agent.get_move(state) in state.legal_moves
+
+
+def test_cache_size(seeded_state):
+    agent = ExpectimaxAgent(depth=3, cache_size=50)
+    for seed in range(3):
+        agent.get_move(seeded_state(seed))
+        assert len(agent._cache) <= 50
+
+
+def test_symmetric_cache(seeded_state):
+    plain = ExpectimaxAgent(depth=2)
+    symmetric = ExpectimaxAgent(depth=2, symmetric_cache=True)
+    for seed in range(4):
+        state = seeded_state(seed)
+        assert symmetric.get_move(state) == plain.get_move(state)
+
+
+def test_time_budget(seeded_state):
+    agent = ExpectimaxAgent(depth=10, time_budget=0.05)
+    state = seeded_state()
+    # The first decision keeps to the budget too, since the tables are built upfront
+    start = perf_counter()
+    move = agent.get_move(state)
+    assert perf_counter() - start < 0.25
+    assert move in state.legal_moves
+    assert agent.decisions == 1
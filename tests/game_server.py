@@ -0,0 +1,84 @@
+from threading import Thread
+
+from core.model import RandomStream, State
+from core.model.grid import Grid
+from server import GameClient, GameServer, GameStore
+
+
+def start_server() -> GameServer:
+    server = GameServer(("127.0.0.1", 0))
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_batched_games():
+    server = start_server()
+    with GameClient(port=server.server_port) as client:
+        games = client.create(8, seed=10)
+        states = {
+            game["id"]: State(rng=RandomStream(10 + i)) for i, game in enumerate(games)
+        }
+        for game in games:
+            assert game["grid"] == states[game["id"]].grid.to_list()
+        num_moves = 0
+        playing = dict(states)
+        while playing:
+            moves = {game_id: state.legal_moves[0] for game_id, state in playing.items()}
+            results = client.make_moves({i: move.name for i, move in moves.items()})
+            for game_id, move in moves.items():
+                playing[game_id].make_move(move)
+                num_moves += 1
+                assert results[game_id]["moved"]
+                assert results[game_id]["grid"] == playing[game_id].grid.to_list()
+                assert results[game_id]["points"] == playing[game_id].points
+                if results[game_id]["game_over"]:
+                    del playing[game_id]
+        metrics = client.metrics()
+        assert metrics["games"] == 8
+        assert metrics["moves"] == num_moves
+        assert metrics["latency"]["POST /moves"]["count"] > 0
+    server.shutdown()
+    server.server_close()
+
+
+def test_errors():
+    server = start_server()
+    with GameClient(port=server.server_port) as client:
+        (game,) = client.create()
+        results = client.make_moves({game["id"]: "sideways", "missing": "left"})
+        assert "error" in results[game["id"]]
+        assert "error" in results["missing"]
+        client.delete(game["id"])
+        try:
+            client.get(game["id"])
+        except RuntimeError:
+            pass
+        else:
+            assert False
+        # Unknown paths are recorded under one key, however many there are
+        for path in ("/a", "/b", "/c/d"):
+            try:
+                client.request("GET", path)
+            except RuntimeError:
+                pass
+        latency = client.metrics()["latency"]
+        assert latency["unknown"]["count"] == 3
+        assert not any(route.endswith(("/a", "/b", "/c")) for route in latency)
+        # A single request can't create an unbounded number of games
+        try:
+            client.create(GameStore.MAX_CREATE + 1)
+        except RuntimeError:
+            pass
+        else:
+            assert False
+    server.shutdown()
+    server.server_close()
+
+
+def test_illegal_move():
+    store = GameStore()
+    (game,) = store.create()
+    store._games[game["id"]] = State(Grid([2] + [0] * 15))
+    result = store.make_moves({game["id"]: "left"})[game["id"]]
+    assert not result["moved"]
+    assert result["grid"] == [2] + [0] * 15
@@ -45,3 +45,25 @@ def test_grid_slice():
     expected_lists = [[x for x in range(i, i + 12 + 1, 4)][::-1] for i in range(4)]
     for slice, expected in zip(slices, expected_lists):
         assert slice == expected
+
+
+def test_empty_cells():
+    grid = Grid([0, 2, 0, 4, 2, 2, 0, 0, 0, 0, 0, 0, 8, 8, 8, 8])
+    assert sorted(grid.empty_cells) == grid.where(lambda x: x == 0)
+    grid[0] = 2
+    grid[GridIndex(3, 3)] = 0
+    grid[1] = 0
+    grid[5] = 4
+    assert sorted(grid.empty_cells) == grid.where(lambda x: x == 0)
+    assert grid.empty_count == 9
+    assert grid.random_empty(lambda: 0.999) in grid.empty_cells
+
+
+def test_read_write_line():
+    grid = Grid([i for i in range(16)], width=4, height=4)
+    view = GridView(grid, select_rows=False, axis=1, reverse=True)
+    assert view.offsets == (13, 9, 5, 1)
+    assert view.read_line() == [13, 9, 5, 1]
+    view.write_line([0, 0, 7, 1])
+    assert grid.where(lambda x: x == 0) == [0, 9, 13]
+    assert view == [0, 0, 7, 1]
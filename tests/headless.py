@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+from core.stats import GameStats
+from simulate import play_game, run
+
+
+def test_seeded_games_repeat():
+    first = play_game("random", 0, 7)
+    second = play_game("random", 0, 7)
+    assert first["score"] == second["score"]
+    assert first["moves"] == second["moves"]
+
+
+def test_run(tmp_path):
+    output = tmp_path / "results.jsonl"
+    stats_path = tmp_path / "stats.json"
+    run("random", 6, 2, 10, str(output), stats_path=str(stats_path))
+    with open(output) as f:
+        results = [json.loads(line) for line in f]
+    # Every game is streamed, in whatever order the workers finish them
+    assert sorted(result["game"] for result in results) == list(range(6))
+    assert all("stats" not in result for result in results)
+    stats = GameStats.load(str(stats_path))
+    assert stats.games == 6
+    assert stats.scores.mean == pytest.approx(sum(r["score"] for r in results) / 6)
+    # A game is reproduced from its seed alone
+    result = results[0]
+    replayed = play_game("random", result["game"], result["seed"])
+    assert replayed["score"] == result["score"]
@@ -0,0 +1,30 @@
+import subprocess
+import sys
+
+import agents
+import views
+
+
+def test_lazy_registries():
+    # Run in a fresh interpreter, as other tests may already have imported the agents
+    code = (
+        "import sys, agents, views; "
+        "views.load_view('cli'); agents.load_agent('random'); "
+        "print('pygame' in sys.modules, 'agents.expectimax_agent' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.split() == ["False", "False"]
+
+
+def test_registry_attributes():
+    assert agents.RandomAgent is agents.load_agent("random")
+    assert views.CLIView is views.load_view("cli")
+    assert "NTupleNetwork" in dir(agents)
+    try:
+        agents.MissingAgent
+    except AttributeError:
+        pass
+    else:
+        assert False
@@ -0,0 +1,51 @@
+from copy import deepcopy
+from random import Random
+
+from core.model import Moves, State
+from core.model.grid import Grid
+from core.model.line_table import (
+    _load_row_tables,
+    line_key,
+    line_tables,
+    row_tables,
+    save_row_tables,
+)
+
+
+def random_lines(num_lines: int = 2000) -> list[list[int]]:
+    rng = Random(0)
+    values = [0, 0, 0, 2, 4, 8, 16, 1024, 2048]
+    return [[rng.choice(values) for _ in range(4)] for _ in range(num_lines)]
+
+
+def test_lines_match_collapse_destructive():
+    left, right, points, collapsible = line_tables()
+    for line in random_lines():
+        key = line_key(line)
+        expected = deepcopy(line)
+        expected_points = State.collapse_destructive(expected)
+        assert list(left[key]) == expected, f"Failed with input {line}."
+        assert points[key] == expected_points, f"Failed with input {line}."
+        assert bool(collapsible[key] & 1) == State.is_list_collapsible(line)
+        reverse = line[::-1]
+        State.collapse_destructive(reverse)
+        assert list(right[key]) == reverse[::-1], f"Failed with input {line}."
+        assert bool(collapsible[key] & 2) == State.is_list_collapsible(line[::-1])
+
+
+def test_line_key_fallback():
+    assert line_key([1, 0, 0, 0]) is None
+    assert line_key([32768, 0, 0, 0]) is None
+    assert line_key([2, 2, 0]) is None
+    state = State(Grid([32768, 32768, 0, 0] + [0] * 12))
+    state.collapse(Moves.LEFT)
+    assert state.grid == [65536] + [0] * 15
+    assert state.points == 65536
+
+
+def test_save_load(tmp_path):
+    path = str(tmp_path / "lines")
+    save_row_tables(path)
+    left, right, _, _, points = row_tables()
+    assert _load_row_tables(path) == (left, right, points)
+    assert _load_row_tables(str(tmp_path / "missing")) is None
@@ -0,0 +1,36 @@
+import pytest
+
+from agents import MonteCarloAgent
+from core.model import RandomStream
+
+
+def test_seeded_single_worker(seeded_state):
+    state = seeded_state()
+    moves = [
+        MonteCarloAgent(num_rollouts=10, workers=1, rng=RandomStream(3)).get_move(state)
+        for _ in range(3)
+    ]
+    assert moves[0] in state.legal_moves
+    assert moves == [moves[0]] * 3
+
+
+@pytest.mark.parametrize("use_threads", [True, False])
+def test_pools(use_threads, seeded_state):
+    agent = MonteCarloAgent(num_rollouts=4, workers=2, use_threads=use_threads)
+    try:
+        for seed in range(2):
+            state = seeded_state(seed)
+            assert agent.get_move(state) in state.legal_moves
+    finally:
+        agent.close()
+
+
+def test_time_budget_only(seeded_state):
+    agent = MonteCarloAgent(num_rollouts=None, time_budget=0.02, workers=1)
+    state = seeded_state()
+    assert agent.get_move(state) in state.legal_moves
+
+
+def test_requires_a_limit():
+    with pytest.raises(ValueError):
+        MonteCarloAgent(num_rollouts=None, time_budget=None)
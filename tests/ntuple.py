@@ -0,0 +1,42 @@
+from core.model import RandomStream
+from core.model.bitboard import encode
+from agents import NTupleAgent, NTupleNetwork
+from agents.ntuple_training import train_episode
+
+
+def test_symmetric_boards_have_equal_values():
+    network = NTupleNetwork()
+    board = encode([2, 4, 8, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 16])
+    network.update(board, 1.0)
+    assert network.value(board) >= network.num_features
+    mirrored = encode([0, 8, 4, 2, 0, 0, 2, 0, 0, 0, 0, 0, 16, 0, 0, 0])
+    assert network.value(mirrored) == network.value(board)
+
+
+def test_save_and_load(tmp_path):
+    network = NTupleNetwork()
+    rng = RandomStream(0)
+    for _ in range(3):
+        train_episode(network, 0.01, rng)
+    path = str(tmp_path / "network.weights")
+    network.save(path)
+    loaded = NTupleNetwork.load(path)
+    assert loaded.patterns == network.patterns
+    board = encode([2, 2, 4, 0, 8, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+    assert loaded.value(board) == network.value(board)
+    assert NTupleAgent(path).network.value(board) == network.value(board)
+
+
+def test_mixed_pattern_lengths():
+    network = NTupleNetwork(patterns=((0, 1, 2, 3), (0, 1, 2, 3, 4, 5)))
+    board = encode([0, 0, 0, 0, 2] + [0] * 11)
+    # Exactly the features covering the tile in cell 4 select another weight than for
+    # the empty board, and every feature stays within the table of its own pattern
+    covering = [
+        any(board_shift == 16 for board_shift, _ in shifts)
+        for _, shifts in network._features
+    ]
+    changed = [a != b for a, b in zip(network.indices(board), network.indices(0))]
+    assert changed == covering
+    for i, index in enumerate(network.indices(board)):
+        assert (index < 16**4) if i < 8 else (16**4 <= index < 16**4 + 16**6)
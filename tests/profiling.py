@@ -0,0 +1,57 @@
+from agents import RandomAgent
+from core import AgentGame, Profiler
+from core.model import RandomStream, State
+from core.profiling import PHASES, bucket
+
+
+def play(profiler=None):
+    agent = RandomAgent(RandomStream(1))
+    state = State(rng=RandomStream(2), keep_history=True)
+    game = AgentGame(agent, state, profiler=profiler)
+    game.play()
+    return game
+
+
+def test_profiled_game():
+    profiler = Profiler()
+    game = play(profiler)
+    # Profiling doesn't change how the game is played
+    assert game.state.grid == play().state.grid
+    assert profiler.games == 1
+    assert profiler.num_moves == game.num_moves
+    for phase in PHASES:
+        # The game over check also runs after the last move
+        count = game.num_moves + (phase == "game_over")
+        assert profiler.phase(phase).count == count
+        assert sum(profiler.phase(phase).histogram) == count
+    # The spawns of the profiled moves are recorded in the history
+    unprofiled = play().state
+    for state in (game.state, unprofiled):
+        state.undo()
+        state.undo()
+    assert game.state.last_spawn == unprofiled.last_spawn is not None
+    game.state.redo()
+    unprofiled.redo()
+    assert game.state.grid == unprofiled.grid
+    assert game.state.last_spawn == unprofiled.last_spawn
+
+
+def test_merge():
+    first, second = Profiler(), Profiler()
+    play(first)
+    play(second)
+    merged = Profiler.from_dict(first.to_dict()).merge(second.to_dict())
+    assert merged.games == 2
+    assert merged.num_moves == first.num_moves + second.num_moves
+    stats = merged.phase("make_move")
+    assert stats.total == first.phase("make_move").total + second.phase(
+        "make_move"
+    ).total
+    assert stats.max == max(first.phase("make_move").max, second.phase("make_move").max)
+
+
+def test_bucket():
+    assert bucket(0.0) == 0
+    assert bucket(1e-6) == 1
+    assert bucket(3e-6) == 2
+    assert bucket(1e9) == 31
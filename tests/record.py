@@ -0,0 +1,27 @@
+from agents import RandomAgent
+from core.model import Moves, RandomStream
+from core.record import GameReader, GameWriter, RecordingGame, decode_move, encode_move
+
+
+def test_encode_move():
+    for move in Moves:
+        for spawn in [None, (0, 2), (15, 4), (7, 2)]:
+            assert decode_move(encode_move(move, spawn)) == (move, spawn)
+
+
+def test_record_and_replay(tmp_path):
+    path = str(tmp_path / "games.rec")
+    final_states = []
+    with GameWriter(path) as writer:
+        for seed in range(10):
+            agent = RandomAgent(RandomStream(seed))
+            game = RecordingGame(agent, writer, rng=RandomStream(seed + 100))
+            game.play()
+            final_states.append((game.state.grid, game.state.points, game.num_moves))
+    with GameReader(path) as reader:
+        assert len(reader) == 10
+        for record, (grid, points, num_moves) in zip(reader, final_states):
+            assert len(record) == num_moves
+            assert record.final_state.grid == grid
+            assert record.final_state.points == points
+        assert reader[3].state_at(0).points == 0
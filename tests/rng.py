@@ -0,0 +1,18 @@
+from random import Random
+
+from core.model import RandomStream, State
+
+
+def test_stream_is_reproducible():
+    a, b = RandomStream(42, block_size=3), RandomStream(42, block_size=3)
+    assert [a.random() for _ in range(10)] == [b.random() for _ in range(10)]
+    assert all(0 <= a.randrange(4) < 4 for _ in range(100))
+
+
+def test_seeded_states_are_reproducible():
+    for rng_type in [Random, RandomStream]:
+        a, b = State(rng=rng_type(7)), State(rng=rng_type(7))
+        assert a.grid == b.grid
+        a.add_tile(num_tiles=5)
+        b.add_tile(num_tiles=5)
+        assert a.grid == b.grid
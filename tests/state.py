@@ -1,4 +1,5 @@
 from copy import deepcopy
+from random import Random
 
 from grid import Grid
 from state import State
@@ -150,3 +151,100 @@ def test_game_over():
     for input, expected in zip(input_arrs, expected):
         state = State(Grid(input))
         assert state.game_over == expected, f"Failed on input: {input}"
+
+
+def test_game_over_fast_paths():
+    # Full grids without cached legal moves, against the legal mask
+    rng = Random(7)
+    for width, height in ((4, 4), (3, 4), (5, 2)):
+        for _ in range(200):
+            values = [2 ** rng.randint(1, 3) for _ in range(width * height)]
+            state = State(Grid(values, width, height))
+            assert state.game_over == (state.copy().legal_mask == 0)
+    assert State(Grid([0] * 16)).game_over
+    assert not State(Grid([2] + [0] * 15)).game_over
+    checkerboard = [2 if (i // 3 + i % 3) % 2 else 4 for i in range(12)]
+    state = State(Grid(checkerboard, 3, 4))
+    assert state.game_over
+    state[0] = 2
+    assert not state.game_over
+
+
+def test_legal_mask():
+    arr = [0 for _ in range(16)]
+    arr[3] = 2
+    state = State(Grid(arr))
+    assert state.legal_mask == State.MOVE_BITS[LEFT] | State.MOVE_BITS[DOWN]
+    assert state.legal_moves == [LEFT, DOWN]
+    state[0] = 2
+    assert state.legal_moves == [LEFT, DOWN, RIGHT]
+    state.collapse(LEFT)
+    assert state.legal_moves == [DOWN, RIGHT]
+
+
+def test_copy():
+    state = State(Grid([2, 0, 0, 0, 0, 8, 0, 0, 0, 0, 4, 0, 0, 0, 0, 16]), points=4)
+    copy = state.copy()
+    copy.make_move(Moves.UP, add_tile=False)
+    assert copy.grid == [2, 8, 4, 16] + [0 for _ in range(12)]
+    assert state.grid == [2, 0, 0, 0, 0, 8, 0, 0, 0, 0, 4, 0, 0, 0, 0, 16]
+    assert copy.points == state.points == 4
+
+
+def test_undo_redo():
+    state = State(keep_history=True)
+    grids, points = [], []
+    for _ in range(10):
+        grids.append(deepcopy(state.grid.to_list()))
+        points.append(state.points)
+        state.make_move(state.legal_moves[0])
+    final_grid, final_points = state.grid.to_list(), state.points
+    for grid, expected_points in zip(reversed(grids), reversed(points)):
+        state.undo()
+        assert state.grid == grid
+        assert state.points == expected_points
+    assert not state.can_undo
+    while state.can_redo:
+        state.redo()
+    assert state.grid == final_grid
+    assert state.points == final_points
+
+
+def test_non_square():
+    state = State(Grid([2, 0, 2, 0, 4, 0, 0, 4, 4, 8, 0, 0], width=3, height=4))
+    assert state.width == 3 and state.height == 4
+    state.collapse(LEFT)
+    assert state.grid == [4, 0, 0, 4, 0, 0, 8, 0, 0, 8, 0, 0]
+    assert state.points == 12
+    state.collapse(UP)
+    assert state.grid == [8, 0, 0, 16, 0, 0, 0, 0, 0, 0, 0, 0]
+    assert state.points == 36
+    state = State(width=6, height=5)
+    assert state.grid.size == 30
+    assert state.empty_count == 28
+
+
+def test_afterstates():
+    states = [State(Grid([1, 1, 0, 2, 4, 0, 0, 4, 2, 8, 8, 0], width=3, height=4))]
+    states += [State(Grid([2, 2, 4, 8, 0, 2, 0, 2, 16, 0, 16, 4, 4, 8, 2, 2]))]
+    state = State()
+    for _ in range(30):
+        states.append(state.copy())
+        if state.game_over:
+            break
+        state.make_move(state.legal_moves[0])
+    for state in states:
+        legal_moves = state.copy().legal_moves
+        afterstates = state.afterstates()
+        assert [after.move for after in afterstates] == MOVES
+        for move, after in zip(MOVES, afterstates):
+            assert after.legal == (move in legal_moves)
+            if after.legal:
+                expected = state.copy()
+                expected.collapse(move)
+                assert after.state.grid == expected.grid.to_list()
+                assert after.state.points == expected.points
+                assert after.points == expected.points - state.points
+            else:
+                assert after.state is None
+        assert state.legal_moves == legal_moves
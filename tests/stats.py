@@ -0,0 +1,55 @@
+import statistics
+from random import Random
+
+from core.stats import GameStats, Histogram, QuantileSketch, RunningStats
+
+
+def test_running_stats_merge():
+    rng = Random(0)
+    numbers = [rng.gauss(1000, 300) for _ in range(1000)]
+    first, second = RunningStats(), RunningStats()
+    for x in numbers[:300]:
+        first.add(x)
+    for x in numbers[300:]:
+        second.add(x)
+    merged = RunningStats.from_dict(first.to_dict()).merge(second)
+    assert merged.count == 1000
+    assert abs(merged.mean - statistics.mean(numbers)) < 1e-9
+    assert abs(merged.variance - statistics.variance(numbers)) < 1e-6
+    assert merged.min == min(numbers) and merged.max == max(numbers)
+
+
+def test_quantile_sketch():
+    rng = Random(1)
+    numbers = [rng.lognormvariate(0, 2) for _ in range(10000)] + [0] * 100
+    first, second = QuantileSketch(0.01), QuantileSketch(0.01)
+    for i, x in enumerate(numbers):
+        (first if i % 2 else second).add(x)
+    sketch = QuantileSketch.from_dict(first.to_dict()).merge(second)
+    numbers.sort()
+    for q in (0.005, 0.1, 0.5, 0.9, 0.99):
+        exact = numbers[int(q * (len(numbers) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * exact + 1e-12
+
+
+def test_histogram_reach():
+    histogram = Histogram([2, 4, 8, 16])
+    for x in [2, 4, 4, 8, 16, 32]:
+        histogram.add(x)
+    assert histogram.at_least(8) == 3
+    assert histogram.at_least(2) == 6
+    assert histogram.at_least(64) == 0
+
+
+def test_game_stats_merge():
+    first, second = GameStats(), GameStats()
+    first.add(1000, 128, 100)
+    second.add(3000, 256, 200)
+    second.add_latency(0.001)
+    merged = GameStats.from_dict(first.to_dict()).merge(second.to_dict())
+    assert merged.games == 2
+    assert merged.scores.mean == 2000
+    assert merged.reach_rate(128) == 1.0
+    assert merged.reach_rate(256) == 0.5
+    assert merged.latencies.count == 1
+    assert merged.summary()["reach"]["256"] == 0.5
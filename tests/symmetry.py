@@ -0,0 +1,42 @@
+from random import Random
+
+from core.model import Moves
+from core.model.bitboard import canonical_board, decode, encode, execute_move
+from core.model.grid import Grid
+from core.model.symmetry import SYMMETRIES, symmetries
+
+
+def random_values(rng: Random) -> list[int]:
+    return [rng.choice([0, 0, 2, 4, 8, 16]) for _ in range(16)]
+
+
+def test_symmetries():
+    assert len(symmetries(4, 4)) == 8
+    assert len(symmetries(3, 5)) == 4
+
+
+def test_canonical_key_is_invariant():
+    rng = Random(0)
+    for _ in range(20):
+        values = random_values(rng)
+        key, symmetry = Grid(values).canonical_key()
+        board, board_symmetry = canonical_board(encode(values))
+        assert decode(board) == [values[i] for i in board_symmetry.permutation(4, 4)]
+        assert list(key) == [values[i] for i in symmetry.permutation(4, 4)]
+        for other in SYMMETRIES:
+            transformed = [values[i] for i in other.permutation(4, 4)]
+            assert Grid(transformed).canonical_key()[0] == key
+            assert canonical_board(encode(transformed))[0] == board
+
+
+def test_moves_map_consistently():
+    rng = Random(1)
+    values = random_values(rng)
+    for symmetry in SYMMETRIES:
+        transformed = encode([values[i] for i in symmetry.permutation(4, 4)])
+        for move in Moves:
+            after = decode(execute_move(encode(values), move)[0])
+            expected = [after[i] for i in symmetry.permutation(4, 4)]
+            result = execute_move(transformed, symmetry.to_transformed(move))[0]
+            assert decode(result) == expected
+            assert symmetry.to_original(symmetry.to_transformed(move)) == move